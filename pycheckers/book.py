@@ -0,0 +1,124 @@
+import argparse
+import logging
+import mmap
+import struct
+from copy import copy
+
+from elements import Board, Color, State
+from moves import signature
+from strategies import AlphaBetaGameStrategy, calculate_all_moves
+
+
+class OpeningBook:
+    '''Best moves of early positions, read straight from a memory-mapped file.
+
+    The file is a header followed by records sorted by the position key (the Zobrist key of the state with
+    the player to move, as in the transposition table), each holding the origin and destination square of
+    the move and its number of steps. A probe is a binary search over the mapped records.'''
+
+    MAGIC = b'PCOB'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBBBxI')
+    RECORD = struct.Struct('<QBBB')
+    KEY = struct.Struct('<Q')
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.rows, self.cols, self._size = OpeningBook.HEADER.unpack_from(self._map)
+        if magic != OpeningBook.MAGIC or version != OpeningBook.VERSION:
+            self._map.close()
+            raise ValueError('Not an opening book: {}'.format(path))
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        self._map.close()
+
+    def probe(self, state: State, color):
+        '''(origin, destination, steps) of the book move of color, None when the position is not in the book'''
+        if (state.rows, state.cols) != (self.rows, self.cols):
+            return None
+
+        key = state.key ^ Color.zobrist_key(color)
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            offset = OpeningBook.HEADER.size + middle * OpeningBook.RECORD.size
+            middle_key = OpeningBook.KEY.unpack_from(self._map, offset)[0]
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                _, origin, destination, steps = OpeningBook.RECORD.unpack_from(self._map, offset)
+                return divmod(origin, self.cols)[::-1], divmod(destination, self.cols)[::-1], steps
+        return None
+
+    def move(self, state: State, color, moves):
+        '''The one of moves the book plays, None when the position is not in the book'''
+        entry = self.probe(state, color)
+        if entry is None:
+            return None
+        origin, destination, steps = entry
+        return next((move for move in moves if len(signature(move)) == steps + 1
+                     and signature(move)[0] == origin and signature(move)[-1] == destination), None)
+
+    @staticmethod
+    def write(path, entries, rows=Board.ROWS, cols=Board.COLS):
+        '''Writes a book of entries mapping position keys to move signatures'''
+        with open(path, 'wb') as f:
+            f.write(OpeningBook.HEADER.pack(OpeningBook.MAGIC, OpeningBook.VERSION, rows, cols, len(entries)))
+            for key in sorted(entries):
+                move = entries[key]
+                (origin_x, origin_y), (destination_x, destination_y) = move[0], move[-1]
+                f.write(OpeningBook.RECORD.pack(key, origin_y * cols + origin_x,
+                                                destination_y * cols + destination_x, len(move) - 1))
+
+
+def build_book(path, light_player, dark_player, plies):
+    '''Searches every position reachable in fewer than plies plies from the initial one with the player to move,
+    and writes the moves found as a book'''
+    players = {Color.LIGHT_PIECE: light_player, Color.DARK_PIECE: dark_player}
+    board = Board()
+    board.prepare_pieces()
+
+    entries = {}
+    positions = [(board.state, Color.LIGHT_PIECE)]
+    for ply in range(plies):
+        next_positions = []
+        for state, color in positions:
+            key = state.key ^ Color.zobrist_key(color)
+            if key in entries:
+                continue
+            player = players[color]
+            move, _ = player.move(state)
+            if move is None:
+                continue
+            entries[key] = signature(move)
+            for reply in calculate_all_moves(state, color):
+                child = copy(state)
+                reply.apply(child)
+                next_positions.append((child, Color.opposite(color)))
+        logging.info('Ply: {}, Positions: {}'.format(ply, len(entries)))
+        positions = next_positions
+
+    OpeningBook.write(path, entries, board.state.rows, board.state.cols)
+    return len(entries)
+
+
+if __name__ == '__main__':
+    from heuristics import light_pieces_maximizing_heuristic, dark_pieces_maximizing_heuristic
+
+    parser = argparse.ArgumentParser(description='Builds an opening book from deep searches')
+    parser.add_argument('path', nargs='?', default='../opening_book.bin')
+    parser.add_argument('--plies', type=int, default=6)
+    parser.add_argument('--depth', type=int, default=10)
+    args = parser.parse_args()
+
+    logging.basicConfig(format='[%(asctime)s][%(levelname)s] %(name)s: %(message)s', level=logging.INFO)
+    build_book(args.path,
+               AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, args.depth),
+               AlphaBetaGameStrategy(Color.DARK_PIECE, dark_pieces_maximizing_heuristic, args.depth),
+               args.plies)
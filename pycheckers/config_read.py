@@ -1,13 +1,19 @@
 import yaml
 
+from book import OpeningBook
 from elements import Color
+from evaluation import piece_square_evaluator
+from ordering import MoveOrdering
+from parallel import ParallelAlphaBetaGameStrategy
+from pondering import PonderingGameStrategy
+from tablebase import Tablebase
 from strategies import RandomGameStrategy, MinMaxGameStrategy, AlphaBetaGameStrategy, ManualGameStrategy
 from heuristics import light_pieces_dark_pieces_difference_heuristic, dark_pieces_light_pieces_difference_heuristic, light_pieces_maximizing_heuristic, dark_pieces_maximizing_heuristic
 
 
 def read_players():
     with open('../game_config.yaml', 'r') as f:
-        game_config = yaml.load(f)
+        game_config = yaml.safe_load(f)
 
         return read_light_player(game_config), read_dark_player(game_config)
 
@@ -30,18 +36,55 @@ def read_player(player_name, color, game_config):
         player = RandomGameStrategy(color)
     else:
         heuristic = get_heuristic_from_string(game_config[player_name]["heuristic"])
-        depth = int(game_config[player_name]["depth"])
 
         if strategy == 'alpha_beta':
-            player = AlphaBetaGameStrategy(color, heuristic, depth)
+            tt_memory_mb = float(game_config[player_name].get("tt_memory_mb", 16))
+            time_ms = game_config[player_name].get("time_ms")
+            if time_ms is not None:
+                time_ms = int(time_ms)
+                depth = int(game_config[player_name].get("depth", AlphaBetaGameStrategy.MAX_DEPTH))
+            else:
+                depth = int(game_config[player_name]["depth"])
+            move_ordering = MoveOrdering() if game_config[player_name].get("move_ordering", True) else None
+            aspiration_window = game_config[player_name].get("aspiration_window")
+            search = game_config[player_name].get("search", "alpha_beta")
+            if search not in ('alpha_beta', 'pvs'):
+                print("wrong search error")
+            opening_book = read_opening_book(game_config[player_name])
+            tablebase = read_tablebase(game_config[player_name])
+            player = AlphaBetaGameStrategy(color, heuristic, depth, tt_memory_mb, time_ms, move_ordering,
+                                           aspiration_window, search == 'pvs', opening_book, tablebase,
+                                           bool(game_config[player_name].get("stats", False)),
+                                           int(game_config[player_name].get("quiescence_nodes", 0)))
+            if game_config[player_name].get("ponder", False):
+                player = PonderingGameStrategy(player)
+        elif strategy == 'parallel_alpha_beta':
+            depth = int(game_config[player_name]["depth"])
+            tt_memory_mb = float(game_config[player_name].get("tt_memory_mb", 16))
+            workers = game_config[player_name].get("workers")
+            mode = game_config[player_name].get("parallel_mode", ParallelAlphaBetaGameStrategy.ROOT_SPLIT)
+            player = ParallelAlphaBetaGameStrategy(color, heuristic, depth, tt_memory_mb, workers, mode,
+                                                   read_opening_book(game_config[player_name]))
         elif strategy == 'min_max':
-            player = MinMaxGameStrategy(color, heuristic, depth)
+            depth = int(game_config[player_name]["depth"])
+            player = MinMaxGameStrategy(color, heuristic, depth, bool(game_config[player_name].get("stats", False)),
+                                        int(game_config[player_name].get("quiescence_nodes", 0)))
         else:
             print("wrong strategy error")
 
     return player
 
 
+def read_opening_book(player_config):
+    path = player_config.get("opening_book")
+    return OpeningBook(path) if path is not None else None
+
+
+def read_tablebase(player_config):
+    path = player_config.get("tablebase")
+    return Tablebase(path) if path is not None else None
+
+
 def get_heuristic_from_string(heuristic_string):
     if heuristic_string == 'dark_pieces_maximizing':
         return dark_pieces_maximizing_heuristic
@@ -51,5 +94,9 @@ def get_heuristic_from_string(heuristic_string):
         return dark_pieces_light_pieces_difference_heuristic
     elif heuristic_string == 'light_pieces_dark_pieces_difference':
         return light_pieces_dark_pieces_difference_heuristic
+    elif heuristic_string == 'dark_pieces_piece_square':
+        return piece_square_evaluator(Color.DARK_PIECE)
+    elif heuristic_string == 'light_pieces_piece_square':
+        return piece_square_evaluator(Color.LIGHT_PIECE)
     else:
         print("wrong heuristic error")
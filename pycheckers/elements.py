@@ -1,32 +1,35 @@
 from abc import ABC, abstractmethod
 from copy import deepcopy, copy
-from typing import Tuple
 
 import numpy as np
-import pkg_resources
-import pygame
+
+from geometry import board_geometry
+from zobrist import PIECE_KEYS, DARK_TO_MOVE_KEY
+
+# codes of the kinds of pieces, Piece.code
+LIGHT_PAWN, LIGHT_KING, DARK_PAWN, DARK_KING = range(4)
 
 
 class Color:
-    LIGHT_PIECE = (255, 255, 255)
-    DARK_PIECE = (0, 0, 0)
-    MARKED_PIECE = (255, 0, 0)
-    LIGHT_SQUARE = (121, 85, 72)
-    DARK_SQUARE = (62, 39, 35)
+    '''Sides of the game as small integer codes, the colors they are drawn in are up to the renderer'''
+    LIGHT_PIECE = 0
+    DARK_PIECE = 1
 
     @staticmethod
-    def name(color: Tuple[int, int, int]):
+    def name(color: int):
         if color == Color.LIGHT_PIECE:
             return 'White'
         elif color == Color.DARK_PIECE:
             return 'Black'
 
     @staticmethod
-    def opposite(color: Tuple[int, int, int]):
-        if color == Color.LIGHT_PIECE:
-            return Color.DARK_PIECE
-        elif color == Color.DARK_PIECE:
-            return Color.LIGHT_PIECE
+    def opposite(color: int):
+        return 1 - color
+
+    # part of the position key that tells whose turn it is
+    @staticmethod
+    def zobrist_key(color: int):
+        return DARK_TO_MOVE_KEY if color == Color.DARK_PIECE else 0
 
 
 class Board:
@@ -35,9 +38,7 @@ class Board:
     FILLED_ROWS = 3
 
     def __init__(self):
-        self._square_colors = np.empty((Board.ROWS, Board.COLS), dtype=Tuple[int, int, int])
-        self._state = State(Board.ROWS, Board.COLS)
-        self._build()
+        self._state = BitboardState(Board.ROWS, Board.COLS)
 
     @property
     def state(self):
@@ -47,18 +48,10 @@ class Board:
     def state(self, value):
         self._state = copy(value)
 
-    def _build(self):
-        for y in range(Board.COLS):
-            for x in range(Board.ROWS):
-                if (y % 2 == 0 and x % 2 == 0) or (y % 2 == 1 and x % 2 == 1):
-                    self._square_colors[y][x] = Color.LIGHT_SQUARE
-                else:
-                    self._square_colors[y][x] = Color.DARK_SQUARE
-
     def prepare_pieces(self):
         for y in range(Board.COLS):
             for x in range(Board.ROWS):
-                if self._square_colors[y][x] is not Color.LIGHT_SQUARE:
+                if self.is_dark_square(x, y):
                     if y < Board.FILLED_ROWS:
                         piece = Pawn(Color.DARK_PIECE)
                         self._state.add(x, y, piece)
@@ -66,24 +59,10 @@ class Board:
                         piece = Pawn(Color.LIGHT_PIECE)
                         self._state.add(x, y, piece)
 
-    def draw(self, surface):
-        for y in range(Board.COLS):
-            for x in range(Board.ROWS):
-                self.draw_square(surface, x, y)
-                if self.state.is_occupied(x, y):
-                    self.state.get_piece(x, y).draw(surface, x, y)
-
-    def draw_square(self, surface, x, y):
-        square_w, square_h = self.square_size(surface)
-        square_rect = pygame.Rect(x * square_w,
-                                  y * square_h,
-                                  square_w, square_h)
-
-        pygame.draw.rect(surface, self._square_colors[x][y], square_rect)
-
+    # pieces only ever stand on the dark squares
     @staticmethod
-    def square_size(surface):
-        return int(surface.get_width() / Board.COLS), int(surface.get_height() / Board.ROWS)
+    def is_dark_square(x, y):
+        return (x + y) % 2 == 1
 
 
 class State:
@@ -93,6 +72,14 @@ class State:
         self.matrix = np.empty((rows, cols), dtype=Piece)
         self.light_pieces = 0
         self.dark_pieces = 0
+        # evaluation features, kept up to date by add() and remove(): kings per color and the rows pieces of
+        # a color have advanced over, counted from their own back row
+        self.light_kings = 0
+        self.dark_kings = 0
+        self.light_advancement = 0
+        self.dark_advancement = 0
+        # Zobrist hash of the pieces, kept up to date by add() and remove()
+        self.key = 0
 
     def __copy__(self):
         cls = self.__class__
@@ -111,18 +98,30 @@ class State:
 
     def add(self, x, y, piece):
         self.matrix[y][x] = piece
+        is_king = isinstance(piece, King)
         if piece.color == Color.LIGHT_PIECE:
             self.light_pieces += 1
+            self.light_kings += is_king
+            self.light_advancement += self.rows - 1 - y
         elif piece.color == Color.DARK_PIECE:
             self.dark_pieces += 1
+            self.dark_kings += is_king
+            self.dark_advancement += y
+        self.key ^= PIECE_KEYS[y * self.cols + x][piece.code]
 
     def remove(self, x, y):
         piece = self.get_piece(x, y)
         self.matrix[y][x] = None
+        is_king = isinstance(piece, King)
         if piece.color == Color.LIGHT_PIECE:
             self.light_pieces -= 1
+            self.light_kings -= is_king
+            self.light_advancement -= self.rows - 1 - y
         elif piece.color == Color.DARK_PIECE:
             self.dark_pieces -= 1
+            self.dark_kings -= is_king
+            self.dark_advancement -= y
+        self.key ^= PIECE_KEYS[y * self.cols + x][piece.code]
 
     def get_piece(self, x, y):
         return self.matrix[y][x]
@@ -130,12 +129,6 @@ class State:
     def get_color(self, x, y):
         return self.matrix[y][x].color
 
-    def get_position(self, piece):
-        for y in range(self.rows):
-            for x in range(self.cols):
-                if self.matrix[y][x] is piece:
-                    return x, y
-
     def is_occupied(self, x, y):
         return self.matrix[y][x] is not None
 
@@ -159,39 +152,189 @@ class State:
         return self.light_pieces == 0 or self.dark_pieces == 0
 
 
-class Piece(ABC):
-    def __init__(self, color: Tuple[int, int, int]):
-        self.color = color
-        self.marked = False
+class BitboardState:
+    '''State keeping pieces in integer masks, one bit per square (bit index y * cols + x)'''
 
-    @staticmethod
-    @abstractmethod
-    def target_positions(x, y):
-        pass
+    __slots__ = ('rows', 'cols', 'light', 'dark', 'kings', 'light_pieces', 'dark_pieces',
+                 'light_kings', 'dark_kings', 'light_advancement', 'dark_advancement', 'key')
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.light = 0
+        self.dark = 0
+        self.kings = 0
+        self.light_pieces = 0
+        self.dark_pieces = 0
+        # evaluation features, see State
+        self.light_kings = 0
+        self.dark_kings = 0
+        self.light_advancement = 0
+        self.dark_advancement = 0
+        # Zobrist hash of the pieces, kept up to date by add(), remove() and transform_into_king()
+        self.key = 0
+
+    @classmethod
+    def from_state(cls, state):
+        result = cls(state.rows, state.cols)
+        for color in (Color.LIGHT_PIECE, Color.DARK_PIECE):
+            for x, y in state.piece_positions(color):
+                result.add(x, y, state.get_piece(x, y))
+        return result
+
+    # compact picklable form, for handing states over to other processes
+    def encode(self):
+        return self.rows, self.cols, self.light, self.dark, self.kings, self.key
+
+    @classmethod
+    def decode(cls, encoding):
+        result = cls.__new__(cls)
+        result.rows, result.cols, result.light, result.dark, result.kings, result.key = encoding
+        result.light_pieces = bin(result.light).count('1')
+        result.dark_pieces = bin(result.dark).count('1')
+        result.light_kings = bin(result.light & result.kings).count('1')
+        result.dark_kings = bin(result.dark & result.kings).count('1')
+        result.light_advancement = sum(result.rows - 1 - y for x, y in result.piece_positions(Color.LIGHT_PIECE))
+        result.dark_advancement = sum(y for x, y in result.piece_positions(Color.DARK_PIECE))
+        return result
+
+    def __copy__(self):
+        result = BitboardState.__new__(BitboardState)
+        result.rows = self.rows
+        result.cols = self.cols
+        result.light = self.light
+        result.dark = self.dark
+        result.kings = self.kings
+        result.light_pieces = self.light_pieces
+        result.dark_pieces = self.dark_pieces
+        result.light_kings = self.light_kings
+        result.dark_kings = self.dark_kings
+        result.light_advancement = self.light_advancement
+        result.dark_advancement = self.dark_advancement
+        result.key = self.key
+        return result
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
 
-    def draw(self, surface, x, y):
-        square_w, square_h = Board.square_size(surface)
-        square_coordinates = (
-            x * square_w,
-            y * square_h
-        )
-        piece_coordinates = (
-            int(square_coordinates[0] + square_w / 2),
-            int(square_coordinates[1] + square_h / 2)
-        )
-        piece_size = int(min(square_w, square_h) / 2) - 8
-
-        if self.marked:
-            self.draw_marked(surface, piece_coordinates, piece_size)
+    def add(self, x, y, piece):
+        index = y * self.cols + x
+        bit = 1 << index
+        is_king = isinstance(piece, King)
+        if piece.color == Color.LIGHT_PIECE:
+            self.light |= bit
+            self.light_pieces += 1
+            self.light_kings += is_king
+            self.light_advancement += self.rows - 1 - y
+        elif piece.color == Color.DARK_PIECE:
+            self.dark |= bit
+            self.dark_pieces += 1
+            self.dark_kings += is_king
+            self.dark_advancement += y
+        if is_king:
+            self.kings |= bit
+        self.key ^= PIECE_KEYS[index][piece.code]
+
+    def remove(self, x, y):
+        index = y * self.cols + x
+        bit = 1 << index
+        is_king = self.kings & bit != 0
+        if self.light & bit:
+            self.light ^= bit
+            self.light_pieces -= 1
+            self.light_kings -= is_king
+            self.light_advancement -= self.rows - 1 - y
+            self.key ^= PIECE_KEYS[index][LIGHT_KING if is_king else LIGHT_PAWN]
+        elif self.dark & bit:
+            self.dark ^= bit
+            self.dark_pieces -= 1
+            self.dark_kings -= is_king
+            self.dark_advancement -= y
+            self.key ^= PIECE_KEYS[index][DARK_KING if is_king else DARK_PAWN]
+        self.kings &= ~bit
+
+    def get_piece(self, x, y):
+        bit = 1 << (y * self.cols + x)
+        if self.light & bit:
+            code = LIGHT_PAWN
+        elif self.dark & bit:
+            code = DARK_PAWN
         else:
-            self.draw_unmarked(surface, piece_coordinates, piece_size)
+            return None
+        return PIECES[code + 1 if self.kings & bit else code]
 
-    @abstractmethod
-    def draw_marked(self, surface, piece_coordinates, piece_size):
-        pass
+    def get_color(self, x, y):
+        bit = 1 << (y * self.cols + x)
+        if self.light & bit:
+            return Color.LIGHT_PIECE
+        elif self.dark & bit:
+            return Color.DARK_PIECE
+
+    def is_occupied(self, x, y):
+        return (self.light | self.dark) >> (y * self.cols + x) & 1 == 1
+
+    def piece_positions(self, color):
+        if color == Color.LIGHT_PIECE:
+            mask = self.light
+        elif color == Color.DARK_PIECE:
+            mask = self.dark
+        else:
+            return []
+
+        result = []
+        cols = self.cols
+        while mask:
+            low_bit = mask & -mask
+            index = low_bit.bit_length() - 1
+            result.append((index % cols, index // cols))
+            mask ^= low_bit
+        return result
+
+    def is_in_bounds(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def transform_into_king(self, x, y):
+        index = y * self.cols + x
+        bit = 1 << index
+        if self.kings & bit:
+            return
+        if self.light & bit:
+            self.light_kings += 1
+            self.key ^= PIECE_KEYS[index][LIGHT_PAWN] ^ PIECE_KEYS[index][LIGHT_KING]
+        elif self.dark & bit:
+            self.dark_kings += 1
+            self.key ^= PIECE_KEYS[index][DARK_PAWN] ^ PIECE_KEYS[index][DARK_KING]
+        else:
+            return
+        self.kings |= bit
+
+    def is_ending(self):
+        return self.light_pieces == 0 or self.dark_pieces == 0
+
+
+class Piece(ABC):
+    '''Kind and color of a piece. Pieces know nothing about the square they stand on, so there is a single
+    shared instance of every kind and color and creating a piece only looks it up.'''
 
+    __slots__ = ('color', 'code')
+    _instances = {}
+
+    def __new__(cls, color: int):
+        piece = Piece._instances.get((cls, color))
+        if piece is None:
+            piece = super().__new__(cls)
+            piece.color = color
+            # LIGHT_PAWN, LIGHT_KING, DARK_PAWN or DARK_KING
+            piece.code = 2 * color + issubclass(cls, King)
+            Piece._instances[cls, color] = piece
+        return piece
+
+    def __reduce__(self):
+        return self.__class__, (self.color,)
+
+    @staticmethod
     @abstractmethod
-    def draw_unmarked(self, surface, piece_coordinates, piece_size):
+    def target_positions(x, y):
         pass
 
     def __str__(self):
@@ -199,42 +342,22 @@ class Piece(ABC):
 
 
 class Pawn(Piece):
+    __slots__ = ()
+
     @staticmethod
     def target_positions(x, y):
         target_positions = [(x - 1, y + 1), (x + 1, y + 1),
                             (x - 1, y - 1), (x + 1, y - 1)]
         return target_positions
 
-    def draw_marked(self, surface, piece_coordinates, piece_size):
-        pygame.draw.circle(surface, self.color, piece_coordinates, piece_size)
-        pygame.draw.circle(surface, Color.MARKED_PIECE, piece_coordinates, int(piece_size / 2), 1)
-
-    def draw_unmarked(self, surface, piece_coordinates, piece_size):
-        pygame.draw.circle(surface, self.color, piece_coordinates, piece_size)
-
-        if self.color == Color.DARK_PIECE:
-            pygame.draw.circle(surface, Color.LIGHT_PIECE, piece_coordinates, int(piece_size / 2), 1)
-        elif self.color == Color.LIGHT_PIECE:
-            pygame.draw.circle(surface, Color.DARK_PIECE, piece_coordinates, int(piece_size / 2), 1)
-
 
 class King(Pawn):
-    CROWN_IMG = pygame.image.load(pkg_resources.resource_filename(__name__, 'sprites/crown.png'))
+    __slots__ = ()
 
     @staticmethod
     def target_positions(x, y):
-        target_positions = []
-        for j in range(-Board.COLS, Board.COLS):
-            for i in range(-Board.COLS, Board.COLS):
-                if -1 < (x + 1 * i) < Board.COLS and -1 < (y + 1 * j) < Board.COLS and i != 0 and j != 0 and i*i == j*j:
-                    target_positions.append((x + 1 * i, y + 1 * j))
-
-        return target_positions
+        return list(board_geometry(Board.ROWS, Board.COLS).diagonals[x, y])
 
-    def draw_marked(self, surface, piece_coordinates, piece_size):
-        super().draw_marked(surface, piece_coordinates, piece_size)
-        surface.blit(King.CROWN_IMG, piece_coordinates)
 
-    def draw_unmarked(self, surface, piece_coordinates, piece_size):
-        super().draw_unmarked(surface, piece_coordinates, piece_size)
-        surface.blit(King.CROWN_IMG, piece_coordinates)
+# the pieces by their code
+PIECES = (Pawn(Color.LIGHT_PIECE), King(Color.LIGHT_PIECE), Pawn(Color.DARK_PIECE), King(Color.DARK_PIECE))
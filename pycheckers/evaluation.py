@@ -0,0 +1,91 @@
+import numpy as np
+
+from elements import Board, BitboardState, Color, LIGHT_PAWN, LIGHT_KING, DARK_PAWN, DARK_KING
+
+# squares of the encoded states hold the code of their piece plus one, so 0 is an empty square
+EMPTY = 0
+
+
+def encode_bitboards(encodings):
+    '''Stacks BitboardState.encode() tuples of equally sized boards into an (N, rows * cols) array of square codes'''
+    rows, cols = encodings[0][0], encodings[0][1]
+    squares = rows * cols
+    if squares > 64:
+        codes = np.zeros((len(encodings), squares), dtype=np.int8)
+        for i, (_, _, light, dark, kings, _) in enumerate(encodings):
+            for index in range(squares):
+                bit = 1 << index
+                if (light | dark) & bit:
+                    codes[i, index] = (LIGHT_PAWN if light & bit else DARK_PAWN) + (kings & bit != 0) + 1
+        return codes
+
+    masks = np.array([encoding[2:5] for encoding in encodings], dtype=np.uint64)
+    shifts = np.arange(squares, dtype=np.uint64)
+    light, dark, kings = ((masks[:, i, None] >> shifts) & np.uint64(1) for i in range(3))
+    return (light * (LIGHT_PAWN + 1 + kings) + dark * (DARK_PAWN + 1 + kings)).astype(np.int8)
+
+
+def encode_states(states):
+    return encode_bitboards([state.encode() if isinstance(state, BitboardState)
+                             else BitboardState.from_state(state).encode() for state in states])
+
+
+class PieceSquareEvaluator:
+    '''Heuristic scoring every piece by a weight of its kind on its square, for whole batches of states at once.
+
+    tables has a row of rows * cols weights per square code (the EMPTY row is ignored), material holds a weight
+    per square code added on top of the table.'''
+
+    def __init__(self, rows, cols, tables, material=(0, 0, 0, 0, 0)):
+        self.rows = rows
+        self.cols = cols
+        self._weights = np.array(tables) + np.array(material)[:, None]
+        self._weights[EMPTY] = 0
+        self._square_indexes = np.arange(rows * cols)
+
+    def evaluate(self, codes):
+        return self._weights[codes, self._square_indexes].sum(axis=1).tolist()
+
+    def evaluate_encodings(self, encodings):
+        return self.evaluate(encode_bitboards(encodings))
+
+    def __call__(self, state):
+        return self.evaluate(encode_states([state]))[0]
+
+
+# rows every square is away from the start of color, light pieces count them on a board of light_rows rows
+def _advancement_table(rows, cols, color, light_rows=None):
+    light_rows = light_rows or rows
+    return [light_rows - 1 - index // cols if color == Color.LIGHT_PIECE else index // cols
+            for index in range(rows * cols)]
+
+
+def maximizing_evaluator(color, rows=Board.ROWS, cols=Board.COLS):
+    '''Batch version of light_pieces_maximizing_heuristic and dark_pieces_maximizing_heuristic'''
+    own, opposite = ((LIGHT_PAWN, LIGHT_KING), (DARK_PAWN, DARK_KING)) if color == Color.LIGHT_PIECE \
+        else ((DARK_PAWN, DARK_KING), (LIGHT_PAWN, LIGHT_KING))
+    # like distance_to_last_position, light pieces count their rows on a Board.ROWS high board
+    advancement = _advancement_table(rows, cols, color, Board.ROWS)
+    tables = np.zeros((5, rows * cols), dtype=np.int64)
+    material = [0] * 5
+    for code in own:
+        tables[code + 1] = advancement
+        material[code + 1] = 10
+    for code in opposite:
+        material[code + 1] = -10
+    return PieceSquareEvaluator(rows, cols, tables, material)
+
+
+def piece_square_evaluator(color, rows=Board.ROWS, cols=Board.COLS, pawn=100, king=250, advancement=4, center=6):
+    '''Material with kings worth more than pawns, pawns rewarded for advancing and kings for holding the center'''
+    tables = np.zeros((5, rows * cols), dtype=np.int64)
+    center_distance = [abs(2 * (index % cols) - cols + 1) + abs(2 * (index // cols) - rows + 1)
+                       for index in range(rows * cols)]
+    center_bonus = [center * (rows + cols - 2 - distance) // 2 for distance in center_distance]
+    for pawn_code, king_code, table_color in [(LIGHT_PAWN, LIGHT_KING, Color.LIGHT_PIECE),
+                                              (DARK_PAWN, DARK_KING, Color.DARK_PIECE)]:
+        sign = 1 if table_color == color else -1
+        tables[pawn_code + 1] = [sign * (pawn + advancement * rows_advanced)
+                                 for rows_advanced in _advancement_table(rows, cols, table_color)]
+        tables[king_code + 1] = [sign * (king + bonus) for bonus in center_bonus]
+    return PieceSquareEvaluator(rows, cols, tables)
@@ -0,0 +1,63 @@
+from functools import lru_cache
+
+# diagonal directions as (delta_x, delta_y), in the order Pawn.target_positions lists its neighbours
+DIRECTIONS = ((-1, 1), (1, 1), (-1, -1), (1, -1))
+
+
+class Geometry:
+    '''Diagonal rays, neighbours and jump squares of every square on a board of a given size'''
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        # (square, direction) -> squares along the direction, nearest first
+        self.rays = {}
+        # square -> [(direction, adjacent square)]
+        self.neighbours = {}
+        # square -> [(direction, jumped square, landing square)]
+        self.jumps = {}
+        # square -> every square on both diagonals through it, row by row
+        self.diagonals = {}
+        self._build()
+
+    def _build(self):
+        for y in range(self.rows):
+            for x in range(self.cols):
+                square = (x, y)
+                self.neighbours[square] = []
+                self.jumps[square] = []
+                for direction in DIRECTIONS:
+                    ray = tuple(self._walk(square, direction))
+                    self.rays[square, direction] = ray
+                    if len(ray) > 0:
+                        self.neighbours[square].append((direction, ray[0]))
+                    if len(ray) > 1:
+                        self.jumps[square].append((direction, ray[0], ray[1]))
+                self.diagonals[square] = sorted((s for d in DIRECTIONS for s in self.rays[square, d]),
+                                                key=lambda s: (s[1], s[0]))
+
+    def _walk(self, square, direction):
+        x, y = square[0] + direction[0], square[1] + direction[1]
+        while 0 <= x < self.cols and 0 <= y < self.rows:
+            yield x, y
+            x, y = x + direction[0], y + direction[1]
+
+    @staticmethod
+    def direction(start, aim):
+        return (aim[0] > start[0]) - (aim[0] < start[0]), (aim[1] > start[1]) - (aim[1] < start[1])
+
+    # squares strictly between start and aim, followed by aim itself if including_aim
+    def path(self, start, aim, including_aim):
+        result = []
+        for square in self.rays.get((start, self.direction(start, aim)), ()):
+            if square == aim:
+                if including_aim:
+                    result.append(square)
+                break
+            result.append(square)
+        return result
+
+
+@lru_cache(maxsize=None)
+def board_geometry(rows, cols):
+    return Geometry(rows, cols)
@@ -1,13 +1,14 @@
 from elements import State, Color, Board
-from typing import Tuple
 
 
+# all heuristics read the features State keeps up to date on every add and remove, so none of them scans the board
+
 def light_pieces_dark_pieces_difference_heuristic(state: State):
-    return len(state.piece_positions(Color.LIGHT_PIECE)) - len(state.piece_positions(Color.DARK_PIECE))
+    return state.light_pieces - state.dark_pieces
 
 
 def dark_pieces_light_pieces_difference_heuristic(state: State):
-    return len(state.piece_positions(Color.DARK_PIECE)) - len(state.piece_positions(Color.LIGHT_PIECE))
+    return state.dark_pieces - state.light_pieces
 
 
 def light_pieces_maximizing_heuristic(state: State):
@@ -18,12 +19,9 @@ def dark_pieces_maximizing_heuristic(state: State):
     return 10 * dark_pieces_light_pieces_difference_heuristic(state) + distance_to_last_position(state, Color.DARK_PIECE)
 
 
-def distance_to_last_position(state: State, color: Tuple[int, int, int]):
-    value = 0
+def distance_to_last_position(state: State, color: int):
     if color == Color.LIGHT_PIECE:
-        for x, y in state.piece_positions(color):
-            value += Board.ROWS - 1 - y
+        # light pieces count their rows on a Board.ROWS high board, whatever the size of the state
+        return state.light_advancement + (Board.ROWS - state.rows) * state.light_pieces
     else:
-        for x, y in state.piece_positions(color):
-                value += y
-    return value
+        return state.dark_advancement
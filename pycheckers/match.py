@@ -0,0 +1,104 @@
+import json
+import logging
+import time
+from collections import Counter
+
+from elements import Board, Color, State
+from moves import as_steps, signature
+
+
+class GameRecord:
+    '''Result of a played match: the winner (None for a draw), why it ended and every move with its thinking time'''
+
+    def __init__(self, winner, reason, moves, stats=None):
+        self.winner = winner
+        self.reason = reason
+        # (color, move signature, seconds)
+        self.moves = moves
+        # SearchStats of every move, None for players that do not collect them
+        self.stats = stats if stats is not None else [None] * len(moves)
+
+    @property
+    def plies(self):
+        return len(self.moves)
+
+    def mean_move_time(self, color):
+        times = [seconds for move_color, _, seconds in self.moves if move_color == color]
+        return sum(times) / len(times) if times else 0.0
+
+    def to_dict(self):
+        record = {
+            'winner': Color.name(self.winner) if self.winner is not None else None,
+            'reason': self.reason,
+            'plies': self.plies,
+            'moves': [[Color.name(color), [list(square) for square in move], seconds]
+                      for color, move, seconds in self.moves]
+        }
+        if any(stats is not None for stats in self.stats):
+            record['stats'] = [stats.to_dict() if stats is not None else None for stats in self.stats]
+        return record
+
+    def __str__(self):
+        return json.dumps(self.to_dict())
+
+
+class Match:
+    '''Plays two strategies against each other to the end, without any display.
+
+    A game is drawn after max_plies plies or when the same position with the same player to move comes up
+    for the repetitions-th time.'''
+
+    NO_MOVES, MOVE_LIMIT, REPETITION = 'no_moves', 'move_limit', 'repetition'
+
+    def __init__(self, light_player, dark_player, max_plies=200, repetitions=3, state: State = None,
+                 color=Color.LIGHT_PIECE):
+        self._players = {Color.LIGHT_PIECE: light_player, Color.DARK_PIECE: dark_player}
+        self._max_plies = max_plies
+        self._repetitions = repetitions
+        self._state = state
+        self._color = color
+
+    def play(self):
+        if self._state is None:
+            board = Board()
+            board.prepare_pieces()
+            state = board.state
+        else:
+            state = self._state
+
+        positions = Counter()
+        moves = []
+        stats = []
+        color = self._color
+        while True:
+            position = state.key ^ Color.zobrist_key(color)
+            positions[position] += 1
+            if positions[position] >= self._repetitions:
+                return GameRecord(None, Match.REPETITION, moves, stats)
+            if len(moves) >= self._max_plies:
+                return GameRecord(None, Match.MOVE_LIMIT, moves, stats)
+
+            start = time.perf_counter()
+            result = self._players[color].move(state)
+            seconds = time.perf_counter() - start
+            if not result or not result[0]:
+                return GameRecord(Color.opposite(color), Match.NO_MOVES, moves, stats)
+
+            move, is_next_beat = result
+            steps = as_steps(move, state)
+            for step in steps:
+                step.apply(state)
+            moves.append((color, signature(move), seconds))
+            stats.append(getattr(self._players[color], 'stats', None))
+            logging.debug('Player: {}, Move: {}'.format(Color.name(color), steps[-1]))
+
+            # a player that has not finished its beat moves again
+            if not is_next_beat:
+                color = Color.opposite(color)
+
+
+if __name__ == '__main__':
+    from config_read import read_players
+
+    logging.basicConfig(format='[%(asctime)s][%(levelname)s] %(name)s: %(message)s', level=logging.INFO)
+    print(Match(*read_players()).play())
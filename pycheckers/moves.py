@@ -1,23 +1,39 @@
-import logging
-import numpy as np
 from copy import copy
 
 from elements import State, Color, Pawn, King, Board
+from geometry import board_geometry
+
+
+class UndoRecord:
+    '''Everything a move changed on a state: the moved piece, as it was before a promotion, and the beaten piece'''
+
+    __slots__ = ('piece', 'beat_position', 'beat_piece')
+
+    def __init__(self, piece, beat_position=None, beat_piece=None):
+        self.piece = piece
+        self.beat_position = beat_position
+        self.beat_piece = beat_piece
 
 
 class PawnMove:
     '''Move from one position to another without beating'''
 
     def __init__(self, state: State, piece_position, target_position):
-        self._state = copy(state)
+        # the state is only read while validating, moves are played with apply() or execute()
+        self._state = state
         self.piece_position = piece_position
         self.target_position = target_position
         self.final_position = target_position
         self.piece = state.get_piece(*self.piece_position)
         self.transform = False
+        # set on the later steps of a beat, which are built against the state before the whole beat
+        self.previous_step = None
+        self._undo_record = None
 
     @property
     def state(self):
+        if self.previous_step is not None:
+            return self.previous_step.execute()
         return copy(self._state)
 
     def is_valid(self):
@@ -35,12 +51,27 @@ class PawnMove:
 
     def execute(self):
         next_state = self.state
-        next_state.remove(*self.piece_position)
-        next_state.add(self.final_position[0], self.final_position[1], self.piece)
-        if self.transform:
-            next_state.transform_into_king(*self.final_position)
+        self.apply(next_state)
         return next_state
 
+    # play the move in place, undo() reverts it
+    def apply(self, state: State):
+        piece = state.get_piece(*self.piece_position)
+        state.remove(*self.piece_position)
+        state.add(self.final_position[0], self.final_position[1], piece)
+        if self.transform:
+            state.transform_into_king(*self.final_position)
+        self._undo_record = UndoRecord(piece)
+        return self._undo_record
+
+    def undo(self, state: State):
+        record = self._undo_record
+        state.remove(*self.final_position)
+        state.add(self.piece_position[0], self.piece_position[1], record.piece)
+        if record.beat_position is not None:
+            state.add(record.beat_position[0], record.beat_position[1], record.beat_piece)
+        self._undo_record = None
+
     def is_to_last_position(self):
         if self.piece.color == Color.DARK_PIECE and self.final_position[1] == self._state.rows - 1:
             return True
@@ -51,37 +82,15 @@ class PawnMove:
     # get all possible positions where the Piece can be placed after beating piece.
     @staticmethod
     def calculate_final_positions(piece_position, target_position):
-        final_positions = []
-        y = target_position[1]
-        x = target_position[0]
-        sign_y = np.sign(y - piece_position[1])
-        sign_x = np.sign(x - piece_position[0])
-        for j in range(-Board.COLS, Board.COLS):
-            for i in range(-Board.COLS, Board.COLS):
-                # every field after the beating piece (in the context of attacking piece)
-                if -1 < (x + sign_x * i) < Board.COLS and -1 < (y + sign_y * j) < Board.COLS:
-                    # fields on diagonal in the right direction
-                    if i * i == j * j and j > 0 and i > 0:
-                        final_positions.append(((x + sign_x * i), (y + sign_y * j)))
-        return final_positions
+        geometry = board_geometry(Board.ROWS, Board.COLS)
+        return list(geometry.rays.get((target_position, geometry.direction(piece_position, target_position)), ()))
 
     # check if any other Piece stay on a path between piece_position and target_position
     def is_path_empty(self, start_position, aim_position, including_aim):
-        param = 1 if including_aim else 0
-        y = aim_position[1]
-        x = aim_position[0]
-        sign_y = np.sign(y - start_position[1])
-        sign_x = np.sign(x - start_position[0])
-        for j in range(-Board.COLS, Board.COLS):
-            for i in range(-Board.COLS, Board.COLS):
-                # every field after the beating piece (in the context of attacking piece)
-                if -1 < (x + sign_x * i) < Board.COLS and -1 < (y + sign_y * j) < Board.COLS:
-                    # fields between attacking piece and the aim (including the aim position or not)
-                    if i * i == j * j and j < param and i < param:
-                        if sign_x * (x + sign_x * i) > sign_x * start_position[0] \
-                                and sign_y * (y + sign_y * j) > sign_y * start_position[1]:
-                            if self.state.is_occupied((x + sign_x * i), (y + sign_y * j)):
-                                return False
+        geometry = board_geometry(self._state.rows, self._state.cols)
+        for x, y in geometry.path(start_position, aim_position, including_aim):
+            if self._state.is_occupied(x, y):
+                return False
         return True
 
     def __str__(self):
@@ -93,24 +102,26 @@ class PawnMove:
 class PawnBeat(PawnMove):
     def __init__(self, state: State, piece_position, target_position):
         super().__init__(state, piece_position, target_position)
-        self.beat_piece = self.state.get_piece(*target_position)
+        self.beat_piece = self._state.get_piece(*target_position)
         self.next_beats = []
         self.final_position = self.calculate_final_position()
 
     def is_valid(self):
         final_position = self.calculate_final_position()
-        return self.state.is_in_bounds(*final_position) \
-               and not self.state.is_occupied(*final_position) \
+        return self._state.is_in_bounds(*final_position) \
+               and not self._state.is_occupied(*final_position) \
                and self.piece.color != self.beat_piece.color
 
-    def execute(self):
-        next_state = self.state
-        next_state.remove(*self.piece_position)
-        next_state.remove(*self.target_position)
-        next_state.add(self.final_position[0], self.final_position[1], self.piece)
+    def apply(self, state: State):
+        piece = state.get_piece(*self.piece_position)
+        beat_piece = state.get_piece(*self.target_position)
+        state.remove(*self.piece_position)
+        state.remove(*self.target_position)
+        state.add(self.final_position[0], self.final_position[1], piece)
         if self.transform:
-            next_state.transform_into_king(*self.final_position)
-        return next_state
+            state.transform_into_king(*self.final_position)
+        self._undo_record = UndoRecord(piece, self.target_position, beat_piece)
+        return self._undo_record
 
     # can be replaced by calculate_final_positions() method. Then final pos should be set in constructor, or setter method.
     def calculate_final_position(self):
@@ -157,3 +168,91 @@ class KingBeat(PawnBeat):
                 return True
             return False
         return False
+
+
+class Move:
+    '''A whole move of a piece, beats and promotion included, that keeps no state.
+
+    squares are the origin followed by every square the piece lands on, captures the squares of the beaten
+    pieces and beaten the pieces themselves, so the move can be played by apply() on whatever state it is handed
+    and taken back by undo() without remembering anything. Moves are not changed once created.'''
+
+    __slots__ = ('squares', 'captures', 'beaten', 'promotion')
+
+    def __init__(self, squares, captures=(), beaten=(), promotion=False):
+        self.squares = squares
+        self.captures = captures
+        self.beaten = beaten
+        self.promotion = promotion
+
+    @property
+    def origin(self):
+        return self.squares[0]
+
+    @property
+    def destination(self):
+        return self.squares[-1]
+
+    def apply(self, state: State):
+        origin, destination = self.squares[0], self.squares[-1]
+        piece = state.get_piece(*origin)
+        state.remove(*origin)
+        # a king may land where it beat a piece earlier in the move
+        for x, y in self.captures:
+            state.remove(x, y)
+        state.add(destination[0], destination[1], piece)
+        if self.promotion:
+            state.transform_into_king(*destination)
+
+    def undo(self, state: State):
+        origin, destination = self.squares[0], self.squares[-1]
+        piece = state.get_piece(*destination)
+        state.remove(*destination)
+        state.add(origin[0], origin[1], Pawn(piece.color) if self.promotion else piece)
+        for (x, y), beaten_piece in zip(self.captures, self.beaten):
+            state.add(x, y, beaten_piece)
+
+    def execute(self, state: State):
+        next_state = copy(state)
+        self.apply(next_state)
+        return next_state
+
+    def steps(self, state: State):
+        '''The move as PawnMove, PawnBeat, KingMove or KingBeat steps on the state it is played from, for the
+        code that shows or plays moves step by step'''
+        piece = state.get_piece(*self.squares[0])
+        if not self.captures:
+            step = (KingMove if isinstance(piece, King) else PawnMove)(state, self.squares[0], self.squares[1])
+            step.transform = self.promotion
+            return [step]
+
+        steps = []
+        for piece_position, target_position, final_position in zip(self.squares, self.captures, self.squares[1:]):
+            if isinstance(piece, King):
+                step = KingBeat(state, piece_position, target_position, final_position)
+            else:
+                step = PawnBeat(state, piece_position, target_position)
+            # the later steps are built against the state before the whole move
+            if steps:
+                step.piece = piece
+                step.previous_step = steps[-1]
+                steps[-1].next_beats.append(step)
+            steps.append(step)
+        steps[-1].transform = self.promotion
+        return steps
+
+    def __str__(self):
+        return '[{}] {}'.format(self.__class__.__name__,
+                                ' -> '.join('({},{})'.format(x, y) for x, y in self.squares))
+
+
+# the steps of a move of an engine, a human player hands over steps already
+def as_steps(move, state: State):
+    return move.steps(state) if isinstance(move, Move) else move
+
+
+# hashable identity of a move: the starting square followed by every square the piece lands on
+def signature(move):
+    if isinstance(move, Move):
+        return move.squares
+    return (move[0].piece_position,) + tuple(step.final_position for step in move)
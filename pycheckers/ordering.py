@@ -0,0 +1,57 @@
+from moves import signature
+
+
+class MoveOrdering:
+    '''Sorts moves before they are searched: transposition table move, longer beats, promotions, killer moves
+    of the ply and finally the history table'''
+
+    KILLERS_PER_PLY = 2
+
+    def __init__(self):
+        # ply -> signatures of the last quiet moves that caused a cutoff there
+        self._killers = {}
+        # (color, from, to) -> sum of depth * depth over the cutoffs the quiet move caused
+        self._history = {}
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    @property
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def new_search(self):
+        self._killers = {}
+        # older results still say something, but less than new ones
+        self._history = {key: value // 2 for key, value in self._history.items() if value > 1}
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def order(self, moves, color, ply, table_move=None):
+        killers = self._killers.get(ply, ())
+        history = self._history
+
+        def score(move):
+            move_signature = signature(move)
+            return (move_signature == table_move,
+                    len(move.captures),
+                    move.promotion,
+                    move_signature in killers,
+                    history.get((color, move_signature[0], move_signature[-1]), 0))
+
+        return sorted(moves, key=score, reverse=True)
+
+    def record_cutoff(self, move, color, ply, depth, index):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+
+        # beats are already searched first, killers and history only rank quiet moves
+        if move.captures:
+            return
+        move_signature = signature(move)
+        killers = self._killers.setdefault(ply, [])
+        if move_signature not in killers:
+            killers.insert(0, move_signature)
+            del killers[MoveOrdering.KILLERS_PER_PLY:]
+        key = (color, move_signature[0], move_signature[-1])
+        self._history[key] = self._history.get(key, 0) + depth * depth
@@ -0,0 +1,178 @@
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, wait
+from copy import copy
+
+from elements import State, BitboardState, Color
+from heuristics import light_pieces_dark_pieces_difference_heuristic
+from strategies import AlphaBetaGameStrategy, SearchStopped
+from transposition import SharedTranspositionTable
+
+# strategy of the worker process and the state shared with the parent, set up by the pool initializers
+_worker_strategy = None
+_shared_alpha = None
+
+
+def _init_root_split_worker(color, heuristic, depth, tt_memory_mb, shared_alpha, stop_event):
+    global _worker_strategy, _shared_alpha
+    _worker_strategy = AlphaBetaGameStrategy(color, heuristic, depth, tt_memory_mb)
+    _worker_strategy.stop_event = stop_event
+    _shared_alpha = shared_alpha
+
+
+def _search_root_move(encoded_child, depth, alpha, shared_bound=True):
+    strategy = _worker_strategy
+    if strategy._transposition_table is not None:
+        strategy._transposition_table.new_search()
+
+    # moves finished by other workers since this one was submitted may have raised the bound
+    if shared_bound:
+        alpha = max(alpha, _shared_alpha.value)
+    child = BitboardState.decode(encoded_child)
+    value = strategy.alpha_beta(child, Color.opposite(strategy.color), alpha, math.inf, depth - 1)
+    if value > alpha:
+        with _shared_alpha.get_lock():
+            if value > _shared_alpha.value:
+                _shared_alpha.value = value
+    return value, alpha
+
+
+def _init_lazy_smp_helper(color, heuristic, transposition_table, stop_event):
+    global _worker_strategy
+    _worker_strategy = AlphaBetaGameStrategy(color, heuristic, tt_memory_mb=0)
+    _worker_strategy._transposition_table = transposition_table
+    _worker_strategy.stop_event = stop_event
+
+
+def _help_search(encoded_root, depth, seed):
+    strategy = _worker_strategy
+    strategy._transposition_table.new_search()
+    root = BitboardState.decode(encoded_root)
+    moves = strategy._calculate_all_moves(root, strategy.color)
+    # helpers walk the root moves in their own order, so they fill the table with different subtrees
+    random.Random(seed).shuffle(moves)
+    try:
+        strategy._search_root(root, moves, depth)
+    except SearchStopped:
+        pass
+
+
+class ParallelAlphaBetaGameStrategy(AlphaBetaGameStrategy):
+    '''Alpha-beta spread over a process pool.
+
+    root_split searches every root move in its own task and shares the best value found so far as alpha,
+    the chosen move is the one the single process search picks at the same depth. lazy_smp lets helper
+    processes search the same root at the same depth, each in its own move order, all of them sharing one
+    transposition table in shared memory, while this process does its own search with that table. Helpers
+    searching deeper would leave entries this process trusts at its own depth and change the move it picks.
+
+    Both modes stop once the stop event installed by the caller is set.'''
+
+    ROOT_SPLIT, LAZY_SMP = 'root_split', 'lazy_smp'
+    # how often the stop event is checked while waiting for the workers
+    STOP_POLL_SECONDS = 0.05
+
+    def __init__(self, color, heuristic=light_pieces_dark_pieces_difference_heuristic, depth=10, tt_memory_mb=16,
+                 workers=None, mode=ROOT_SPLIT, opening_book=None):
+        super().__init__(color, heuristic, depth, tt_memory_mb, opening_book=opening_book)
+        self._workers = workers or os.cpu_count()
+        self._mode = mode
+        self._tt_memory_mb = tt_memory_mb
+        self._executor = None
+        # stops the searches of the worker processes, set once a move is found or the search is stopped
+        self._workers_stop_event = multiprocessing.Event()
+        if mode == ParallelAlphaBetaGameStrategy.LAZY_SMP:
+            self._transposition_table = SharedTranspositionTable(tt_memory_mb or 16)
+        else:
+            # every worker keeps its own table, this process does not search
+            self._transposition_table = None
+            self._shared_alpha = multiprocessing.Value('d', -math.inf)
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self._mode == ParallelAlphaBetaGameStrategy.LAZY_SMP:
+                self._executor = ProcessPoolExecutor(self._workers, initializer=_init_lazy_smp_helper,
+                                                     initargs=(self._color, self._heuristic,
+                                                               self._transposition_table,
+                                                               self._workers_stop_event))
+            else:
+                self._executor = ProcessPoolExecutor(self._workers, initializer=_init_root_split_worker,
+                                                     initargs=(self._color, self._heuristic, self._depth,
+                                                               self._tt_memory_mb, self._shared_alpha,
+                                                               self._workers_stop_event))
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def move(self, state: State):
+        # workers get the compact encoding, not pickled pieces
+        state = copy(state) if isinstance(state, BitboardState) else BitboardState.from_state(state)
+        moves = self._calculate_all_moves(state, self._color)
+        if len(moves) <= 1:
+            return (moves[0] if moves else None), False
+        book_move = self._opening_book.move(state, self._color, moves) if self._opening_book is not None else None
+        if book_move is not None:
+            return book_move, False
+
+        self._workers_stop_event.clear()
+        if self._mode == ParallelAlphaBetaGameStrategy.LAZY_SMP:
+            return self._lazy_smp(state, moves), False
+        return self._root_split(state, moves), False
+
+    # results of the futures in order, waiting for them only as long as the caller lets the search run
+    def _results(self, futures):
+        while wait(futures, ParallelAlphaBetaGameStrategy.STOP_POLL_SECONDS).not_done:
+            if self._should_stop():
+                for future in futures:
+                    future.cancel()
+                self._workers_stop_event.set()
+                wait(futures)
+                raise SearchStopped()
+        return [future.result() for future in futures]
+
+    def _root_split(self, state: BitboardState, moves):
+        children = []
+        for move in moves:
+            self._apply(state, move)
+            children.append(state.encode())
+            self._undo(state, move)
+
+        executor = self._get_executor()
+        self._shared_alpha.value = -math.inf
+        # the first move is searched alone, the others start with its value as their bound
+        results = self._results([executor.submit(_search_root_move, children[0], self._depth, -math.inf)])
+        results += self._results([executor.submit(_search_root_move, child, self._depth, results[0][0])
+                                  for child in children[1:]])
+
+        # a value above the alpha it was searched with is exact, anything else is only an upper bound, without
+        # any exact value every move loses and the first one is played like in the single process search
+        if all(value <= alpha for value, alpha in results):
+            return moves[0]
+        best_value = max(value for value, alpha in results if value > alpha)
+        best_index = min(i for i, (value, alpha) in enumerate(results) if value > alpha and value == best_value)
+
+        # the single process search takes the first of equally good moves, so earlier moves whose bound hides
+        # such a tie are searched again with a full window
+        tied = [i for i, (value, alpha) in enumerate(results[:best_index]) if alpha == best_value]
+        futures = [executor.submit(_search_root_move, children[i], self._depth, -math.inf, False) for i in tied]
+        for i, (value, alpha) in zip(tied, self._results(futures)):
+            if value == best_value:
+                best_index = i
+                break
+        return moves[best_index]
+
+    def _lazy_smp(self, state: BitboardState, moves):
+        executor = self._get_executor()
+        self._transposition_table.new_search()
+        helpers = [executor.submit(_help_search, state.encode(), self._depth, i) for i in range(self._workers)]
+        try:
+            best_move, best_value = self._search_root(state, moves, self._depth)
+        finally:
+            self._workers_stop_event.set()
+            wait(helpers)
+        return best_move
@@ -0,0 +1,65 @@
+import argparse
+import time
+from copy import copy
+
+from elements import Board, Color, State
+from moves import signature
+from strategies import calculate_all_moves
+
+
+def perft(state: State, color, depth):
+    '''Number of move sequences of depth plies from the state, with color to move first'''
+    return _perft(copy(state), color, depth)
+
+
+def _perft(state, color, depth):
+    if depth == 0:
+        return 1
+    moves = calculate_all_moves(state, color)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        move.apply(state)
+        nodes += _perft(state, Color.opposite(color), depth - 1)
+        move.undo(state)
+    return nodes
+
+
+def divide(state: State, color, depth):
+    '''perft split by the root move, as a dict of move signatures'''
+    state = copy(state)
+    counts = {}
+    for move in calculate_all_moves(state, color):
+        move.apply(state)
+        counts[signature(move)] = _perft(state, Color.opposite(color), depth - 1)
+        move.undo(state)
+    return counts
+
+
+def initial_state():
+    board = Board()
+    board.prepare_pieces()
+    return board.state
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Counts the move sequences from the initial position')
+    parser.add_argument('depth', type=int, nargs='?', default=6)
+    parser.add_argument('--divide', action='store_true', help='print the count of every root move')
+    args = parser.parse_args()
+
+    state = initial_state()
+    for depth in range(1, args.depth + 1):
+        start = time.perf_counter()
+        if args.divide and depth == args.depth:
+            counts = divide(state, Color.LIGHT_PIECE, depth)
+            for move, count in counts.items():
+                print('{}: {}'.format(' -> '.join(map(str, move)), count))
+            nodes = sum(counts.values())
+        else:
+            nodes = perft(state, Color.LIGHT_PIECE, depth)
+        seconds = time.perf_counter() - start
+        print('Depth: {}, Nodes: {}, Time: {:.3f} s, Nodes/s: {:.0f}'.format(depth, nodes, seconds,
+                                                                          nodes / seconds if seconds else 0))
@@ -0,0 +1,111 @@
+import logging
+import threading
+from copy import copy
+
+from elements import State, Color
+from moves import signature
+from strategies import GameStrategy, AlphaBetaGameStrategy, SearchStopped
+
+
+class PonderingGameStrategy(GameStrategy):
+    '''Alpha-beta that keeps searching while the opponent thinks.
+
+    After every move it searches, on a background thread, its answers to the opponent's replies, the reply
+    its transposition table expects first. Answers are cached by position, so a predicted reply is answered
+    at once, and the cache is thrown away on every move. Meant for play against a human, against another
+    engine both would compete for the same interpreter.'''
+
+    def __init__(self, strategy: AlphaBetaGameStrategy):
+        super().__init__(strategy.color)
+        self._strategy = strategy
+        # position key (with the player to move) -> signature of the best move found there
+        self._answers = {}
+        self._ponder_thread = None
+        self._ponder_stop_event = threading.Event()
+        self._stop_event = None
+        self._stats = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+
+    @property
+    def search_progress(self):
+        return self._strategy.search_progress
+
+    @property
+    def stats(self):
+        '''Stats of the search behind the last move, None when it was answered from pondering'''
+        return self._stats
+
+    @property
+    def stop_event(self):
+        return self._stop_event
+
+    @stop_event.setter
+    def stop_event(self, value):
+        self._stop_event = value
+
+    def move(self, state: State):
+        self._stop_pondering()
+        answer = self._answers.get(state.key ^ Color.zobrist_key(self._color))
+        self._answers = {}
+
+        result = None
+        self._stats = None
+        if answer is not None:
+            result = next(((move, False) for move in self._calculate_all_moves(state, self._color)
+                           if signature(move) == answer), None)
+        if result is not None:
+            self.ponder_hits += 1
+            logging.debug('Ponder hit: {}'.format(answer))
+        else:
+            self.ponder_misses += 1
+            self._strategy.stop_event = self._stop_event
+            result = self._strategy.move(state)
+            self._stats = self._strategy.stats
+
+        if result and result[0]:
+            position = copy(state)
+            self._apply(position, result[0])
+            self._start_pondering(position)
+        return result
+
+    def close(self):
+        self._stop_pondering()
+        if hasattr(self._strategy, 'close'):
+            self._strategy.close()
+
+    def _start_pondering(self, position):
+        self._ponder_stop_event.clear()
+        self._ponder_thread = threading.Thread(target=self._ponder, args=(position,), daemon=True)
+        self._ponder_thread.start()
+
+    def _stop_pondering(self):
+        if self._ponder_thread is not None:
+            self._ponder_stop_event.set()
+            self._ponder_thread.join()
+            self._ponder_thread = None
+
+    def _ponder(self, position):
+        strategy = self._strategy
+        strategy.stop_event = self._ponder_stop_event
+        opponent = Color.opposite(self._color)
+        replies = self._calculate_all_moves(position, opponent)
+
+        # the reply the last search expected goes first
+        table = strategy._transposition_table
+        entry = table.probe(position.key ^ Color.zobrist_key(opponent)) if table is not None else None
+        if entry is not None:
+            replies.sort(key=lambda reply: signature(reply) != entry.best_move)
+
+        for reply in replies:
+            self._apply(position, reply)
+            try:
+                answer = strategy.move(position)
+            except SearchStopped:
+                answer = None
+            # a search cut short by the opponent's move may be shallower than a real one, so it is not kept
+            if self._ponder_stop_event.is_set():
+                break
+            if answer and answer[0]:
+                self._answers[position.key ^ Color.zobrist_key(self._color)] = signature(answer[0])
+            self._undo(position, reply)
@@ -4,45 +4,94 @@ import pygame
 
 from elements import Board, Color
 from config_read import read_players
+from moves import as_steps
+from rendering import BoardRenderer
+from strategies import ManualGameStrategy
+from thinking import BackgroundMove
 
 
 
 
 class Game:
+    CAPTION = 'PyCheckers'
+    # frame rate of the event loop while an engine is thinking, low enough to leave it most of the time
+    THINKING_FPS = 10
+    # frame rate of the event loop while it waits, paused or between moves, so it does not spin
+    IDLE_FPS = 10
+    # how long a cancelled engine gets to stop before its player is closed
+    CANCEL_TIMEOUT_SECONDS = 1
+
     def __init__(self, clock, surface: pygame.Surface, player1, player2, max_fps=1):
         self._clock = clock
         self._surface = surface
         self._max_fps = max_fps
         self._board = Board()
+        self._renderer = BoardRenderer(self._board)
         self._player_1 = player1
         self._player_2 = player2
 
     def run(self):
+        try:
+            self._play()
+        finally:
+            # engines holding worker processes or files release them
+            for player in (self._player_1, self._player_2):
+                if hasattr(player, 'close'):
+                    player.close()
+
+    def _play(self):
         current_player = None
         moves = []
         self._board.prepare_pieces()
 
         paused = False
         is_next_beat = False
+        # move of an engine player being computed on a background thread
+        thinking = None
         while True:
-            self._board.draw(self._surface)
-            pygame.display.update()
+            dirty_rects = self._renderer.draw(self._surface)
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
 
+            moved = False
             if not paused:
                 if moves:
                     move = moves.pop()
                     logging.debug('Player: {}, Move: {}'.format(Color.name(current_player.color), move))
-                    self._board.state = move.execute()
-                    clock.tick(self._max_fps)
-                else:
+                    state = self._board.state
+                    move.apply(state)
+                    self._board.state = state
+                    moved = True
+                    self._clock.tick(self._max_fps)
+                elif thinking is None:
                     if not is_next_beat:
                         current_player = self._player_1 if current_player is not self._player_1 else self._player_2
-                    moves, is_next_beat = current_player.move(self._board.state)
+                    if isinstance(current_player, ManualGameStrategy):
+                        # a human player handles the events itself while waiting for a click
+                        result = current_player.move(self._board.state)
+                        moves, is_next_beat = result if result else (None, False)
+                        if moves:
+                            moves = list(reversed(as_steps(moves, self._board.state)))
+                        else:
+                            break
+                    else:
+                        thinking = BackgroundMove(current_player, self._board.state)
+
+            if thinking is not None:
+                if thinking.done():
+                    result = thinking.result()
+                    thinking = None
+                    pygame.display.set_caption(Game.CAPTION)
+                    moves, is_next_beat = result if result else (None, False)
                     if moves:
-                        if len(moves) > 0:
-                            moves = list(reversed(moves))
+                        moves = list(reversed(as_steps(moves, self._board.state)))
                     else:
                         break
+                else:
+                    self._show_thinking(current_player, thinking.progress)
+                    self._clock.tick(Game.THINKING_FPS)
+            elif not moved:
+                self._clock.tick(Game.IDLE_FPS)
 
             events = pygame.event.get()
             for event in events:
@@ -53,9 +102,21 @@ class Game:
                         self._max_fps += 1
                     elif event.key in [pygame.K_MINUS, pygame.K_KP_MINUS]:
                         self._max_fps -= 1
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self._renderer.invalidate()
                 elif event.type == pygame.QUIT:
+                    if thinking is not None:
+                        thinking.cancel()
+                        thinking.wait(Game.CANCEL_TIMEOUT_SECONDS)
                     return
 
+    @staticmethod
+    def _show_thinking(player, progress):
+        caption = '{} - {} is thinking'.format(Game.CAPTION, Color.name(player.color))
+        if progress is not None:
+            depth, nodes = progress
+            caption += ' (depth {}, {} nodes)'.format(depth, nodes)
+        pygame.display.set_caption(caption)
 
 
 if __name__ == '__main__':
@@ -67,7 +128,7 @@ if __name__ == '__main__':
     clock = pygame.time.Clock()
     resolution = (640, 640)
     screen = pygame.display.set_mode(resolution, pygame.HWSURFACE | pygame.DOUBLEBUF)
-    pygame.display.set_caption('PyCheckers')
+    pygame.display.set_caption(Game.CAPTION)
 
     game = Game(clock, screen, players[0], players[1])
     game.run()
@@ -0,0 +1,90 @@
+import pkg_resources
+import pygame
+
+from elements import Board, Color, King
+
+# RGB colors of the pieces by their side, the one of the other side draws their inner ring
+PIECE_COLORS = {Color.LIGHT_PIECE: (255, 255, 255), Color.DARK_PIECE: (0, 0, 0)}
+LIGHT_SQUARE = (121, 85, 72)
+DARK_SQUARE = (62, 39, 35)
+
+# loaded on the first king drawn, so importing this module needs no display
+_crown_image = None
+
+
+def crown_image():
+    global _crown_image
+    if _crown_image is None:
+        _crown_image = pygame.image.load(pkg_resources.resource_filename(__name__, 'sprites/crown.png'))
+    return _crown_image
+
+
+def square_size(surface):
+    return int(surface.get_width() / Board.COLS), int(surface.get_height() / Board.ROWS)
+
+
+class BoardRenderer:
+    '''Draws a board and its pieces with pygame, the rules engine itself knows nothing about rendering.
+
+    Only the squares whose content changed since the previous frame are drawn again, each one as a single blit
+    of a tile pre-rendered for the current square size.'''
+
+    def __init__(self, board: Board):
+        self._board = board
+        # square -> (king, color) of the piece drawn there on the previous frame
+        self._drawn = None
+        self._size = None
+        self._tiles = {}
+
+    def invalidate(self):
+        '''Makes the next draw repaint the whole board, e.g. after the window was covered'''
+        self._drawn = None
+
+    def draw(self, surface):
+        '''Draws what changed since the last call and returns the rects to pass to pygame.display.update'''
+        size = square_size(surface)
+        if size != self._size:
+            self._size = size
+            self._tiles = {}
+            self._drawn = None
+
+        state = self._board.state
+        pieces = {}
+        for color in (Color.LIGHT_PIECE, Color.DARK_PIECE):
+            for x, y in state.piece_positions(color):
+                piece = state.get_piece(x, y)
+                pieces[x, y] = (isinstance(piece, King), piece.color)
+
+        if self._drawn is None:
+            squares = [(x, y) for y in range(Board.ROWS) for x in range(Board.COLS)]
+        else:
+            squares = [square for square in self._drawn.keys() | pieces.keys()
+                       if self._drawn.get(square) != pieces.get(square)]
+        self._drawn = pieces
+        return [self.draw_square(surface, x, y, pieces.get((x, y))) for x, y in squares]
+
+    def draw_square(self, surface, x, y, piece=None):
+        square_w, square_h = self._size or square_size(surface)
+        square_color = DARK_SQUARE if Board.is_dark_square(x, y) else LIGHT_SQUARE
+        tile = self._tiles.get((square_color, piece))
+        if tile is None:
+            tile = self._tiles[square_color, piece] = self._render_tile(square_w, square_h, square_color, piece)
+        return surface.blit(tile, (x * square_w, y * square_h))
+
+    @staticmethod
+    def _render_tile(square_w, square_h, square_color, piece):
+        tile = pygame.Surface((square_w, square_h))
+        tile.fill(square_color)
+        if piece is None:
+            return tile
+
+        king, color = piece
+        piece_coordinates = (int(square_w / 2), int(square_h / 2))
+        piece_size = int(min(square_w, square_h) / 2) - 8
+
+        pygame.draw.circle(tile, PIECE_COLORS[color], piece_coordinates, piece_size)
+        pygame.draw.circle(tile, PIECE_COLORS[Color.opposite(color)], piece_coordinates, int(piece_size / 2), 1)
+
+        if king:
+            tile.blit(crown_image(), piece_coordinates)
+        return tile
@@ -0,0 +1,65 @@
+import json
+
+
+class SearchStats:
+    '''What one search did, filled in by the strategies that were asked to collect it'''
+
+    def __init__(self):
+        self.nodes = 0
+        self.leaves = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tablebase_hits = 0
+        # nodes searched past the horizon, counted in nodes as well, and horizon nodes that spent their whole
+        # quiescence budget
+        self.quiescence_nodes = 0
+        self.quiescence_exhausted = 0
+        self.seconds = 0.0
+        # (depth, nodes, seconds) of every completed iteration
+        self.iterations = []
+
+    @property
+    def depth(self):
+        return self.iterations[-1][0] if self.iterations else 0
+
+    @property
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def effective_branching_factor(self):
+        '''Growth of the node count between the last two iterations, or its depth-th root after a single one'''
+        if len(self.iterations) >= 2:
+            previous_nodes, nodes = self.iterations[-2][1], self.iterations[-1][1]
+            return nodes / previous_nodes if previous_nodes else 0.0
+        if self.iterations and self.iterations[0][0] > 0:
+            depth, nodes, _ = self.iterations[0]
+            return nodes ** (1 / depth)
+        return 0.0
+
+    def to_dict(self):
+        return {
+            'depth': self.depth,
+            'nodes': self.nodes,
+            'leaves': self.leaves,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoff_rate,
+            'tt_hit_rate': self.tt_hit_rate,
+            'tablebase_hits': self.tablebase_hits,
+            'quiescence_nodes': self.quiescence_nodes,
+            'quiescence_exhausted': self.quiescence_exhausted,
+            'effective_branching_factor': self.effective_branching_factor,
+            'seconds': self.seconds,
+            'iterations': [{'depth': depth, 'nodes': nodes, 'seconds': seconds}
+                           for depth, nodes, seconds in self.iterations]
+        }
+
+    def to_json(self):
+        '''The stats as a single line of JSON'''
+        return json.dumps(self.to_dict())
@@ -1,12 +1,18 @@
+import logging
 import math
 import random
-import pygame
+import time
 from abc import ABC, abstractmethod
-from typing import Tuple
+from copy import copy
 
-from elements import State, Piece, Pawn, King, Color, Board
+from elements import State, BitboardState, King, Color, Board
+from geometry import board_geometry, DIRECTIONS
 from heuristics import light_pieces_dark_pieces_difference_heuristic
-from moves import PawnMove, PawnBeat, KingMove, KingBeat
+from moves import Move, signature
+from ordering import MoveOrdering
+from stats import SearchStats
+from tablebase import DRAW, WIN, WIN_VALUE
+from transposition import TranspositionTable, EXACT, LOWER_BOUND
 
 
 class GameStrategy(ABC):
@@ -21,106 +27,544 @@ class GameStrategy(ABC):
     def move(self, state: State):
         pass
 
-    def _calculate_all_moves(self, state: State, color: Tuple[int, int, int]):
-        beats = []
-        for piece_position in state.piece_positions(color):
-            beats += self._calculate_valid_beats(piece_position, state)
-        if beats:
-            for beat in beats:
-                if isinstance(beat[-1], PawnBeat) and beat[-1].is_to_last_position():
-                    beat[-1].transform = True
-            return beats
-
+    # moves are played and reverted on one state
+    @staticmethod
+    def _apply(state: State, move: Move):
+        move.apply(state)
+
+    @staticmethod
+    def _undo(state: State, move: Move):
+        move.undo(state)
+
+    # scores the positions after each of the moves with a single call of a batch heuristic, the ones where the
+    # player beating has to beat are not quiet and get None
+    @staticmethod
+    def _evaluate_leaves(state: State, moves, heuristic, beating=None):
+        encodings = []
+        quiet = []
+        for move in moves:
+            GameStrategy._apply(state, move)
+            quiet.append(beating is None or not GameStrategy._has_beats(state, beating))
+            if quiet[-1]:
+                encodings.append(state.encode() if isinstance(state, BitboardState)
+                                 else BitboardState.from_state(state).encode())
+            GameStrategy._undo(state, move)
+        values = iter(heuristic.evaluate_encodings(encodings) if encodings else ())
+        return [next(values) if is_quiet else None for is_quiet in quiet]
+
+    @staticmethod
+    def _calculate_all_moves(state: State, color: int):
         moves = []
-        for piece_position in state.piece_positions(color):
-            moves += self._calculate_valid_moves(piece_position, state)
-        if moves:
-            for move in moves:
-                if isinstance(move[-1], PawnMove) and move[-1].is_to_last_position():
-                    move[-1].transform = True
-            return moves
+        for stage in GameStrategy._move_stages(state, color):
+            moves += stage
+        return moves
 
-        return []
+    @staticmethod
+    def _move_stages(state: State, color, first=None):
+        '''The moves of _calculate_all_moves in stages, each one built only when the one before it has been used
+        up: all beats if there are any, otherwise the quiet moves piece by piece. The move with the signature
+        first leads the beats, or comes in a stage of its own before the other quiet moves when it is legal.'''
+        beats = GameStrategy._beats(state, color)
+        if beats:
+            if first is not None:
+                beats.sort(key=lambda beat: signature(beat) != first)
+            yield beats
+            return
+
+        played = None
+        if first is not None and len(first) == 2:
+            piece = state.get_piece(*first[0])
+            if piece is not None and piece.color == color:
+                moves = [move for move in GameStrategy._calculate_valid_moves(first[0], state)
+                         if move.squares[1] == first[1]]
+                if moves:
+                    played = first
+                    yield moves
 
-    def _calculate_valid_moves(self, piece_position, state: State):
+        for piece_position in state.piece_positions(color):
+            moves = GameStrategy._calculate_valid_moves(piece_position, state)
+            if played is not None and piece_position == played[0]:
+                moves = [move for move in moves if move.squares[1] != played[1]]
+            if moves:
+                yield moves
+
+    # every beat of the player, the only moves it has when there are any
+    @staticmethod
+    def _beats(state: State, color):
+        paths = []
+        for piece_position in state.piece_positions(color):
+            paths += GameStrategy._capture_paths(piece_position, state)
+        return GameStrategy._moves_from_paths(state, paths)
+
+    @staticmethod
+    def _has_beats(state: State, color):
+        geometry = board_geometry(state.rows, state.cols)
+        return any(GameStrategy._jumps(state.get_piece(*piece_position), piece_position, state, geometry)
+                   for piece_position in state.piece_positions(color))
+
+    # a pawn becomes a king when its move ends on the far row
+    @staticmethod
+    def _promotes(piece, square, rows):
+        return not isinstance(piece, King) and square[1] == (rows - 1 if piece.color == Color.DARK_PIECE else 0)
+
+    @staticmethod
+    def _calculate_valid_moves(piece_position, state: State):
         moves = []
+        geometry = board_geometry(state.rows, state.cols)
         piece = state.get_piece(*piece_position)
-        target_positions = piece.target_positions(*piece_position)
-        for target_position in target_positions:
-            if state.is_in_bounds(*target_position) and not state.is_occupied(*target_position):
-                move = KingMove(state, piece_position, target_position) if isinstance(piece, King) \
-                       else PawnMove(state, piece_position, target_position)
-                if move.is_valid():
-                    moves.append([move])
+        if isinstance(piece, King):
+            for direction in DIRECTIONS:
+                for target_position in geometry.rays[piece_position, direction]:
+                    if state.is_occupied(*target_position):
+                        break
+                    moves.append(Move((piece_position, target_position)))
+        else:
+            forward = 1 if piece.color == Color.DARK_PIECE else -1
+            for direction, target_position in geometry.neighbours[piece_position]:
+                if direction[1] == forward and not state.is_occupied(*target_position):
+                    moves.append(Move((piece_position, target_position),
+                                      promotion=GameStrategy._promotes(piece, target_position, state.rows)))
         return moves
 
-    def _calculate_valid_beats(self, piece_position, state: State, previous_beat: PawnBeat = None):
-        beats = []
-        if piece_position is None:
-            return beats
+    @staticmethod
+    def _capture_paths(piece_position, state: State):
+        '''Every complete beat of the piece as a tuple (origin, beaten, landing, beaten, landing, ...).
 
+        A depth first search on the state itself: the piece is lifted off and every beaten piece is removed while
+        the search is below it and put back on the way up, so the state is whole again once the paths run out.'''
+        geometry = board_geometry(state.rows, state.cols)
         piece = state.get_piece(*piece_position)
-        target_positions = piece.target_positions(*piece_position)
-        for target_position in target_positions:
-            if state.is_in_bounds(*target_position) and state.is_occupied(*target_position) \
-                    and state.get_color(*target_position) != piece.color:
-                sub_beats = []
-                if isinstance(piece, King):
-                    final_positions = KingBeat.calculate_final_positions(piece_position, target_position)
-                    for final_position in final_positions:
-                        sub_beats.append(KingBeat(state, piece_position, target_position, final_position))
+        path = [piece_position]
+        beaten = []
+        stack = [GameStrategy._jumps(piece, piece_position, state, geometry)]
+        state.remove(*piece_position)
+        try:
+            while stack:
+                if stack[-1]:
+                    target_position, final_position = stack[-1].pop()
+                    beaten.append((target_position, state.get_piece(*target_position)))
+                    state.remove(*target_position)
+                    path += (target_position, final_position)
+                    jumps = GameStrategy._jumps(piece, final_position, state, geometry)
+                    if jumps:
+                        stack.append(jumps)
+                        continue
+                    yield tuple(path)
                 else:
-                    sub_beats.append(PawnBeat(state, piece_position, target_position))
+                    stack.pop()
+                    if not beaten:
+                        break
+                target_position, beaten_piece = beaten.pop()
+                state.add(target_position[0], target_position[1], beaten_piece)
+                del path[-2:]
+        finally:
+            for target_position, beaten_piece in reversed(beaten):
+                state.add(target_position[0], target_position[1], beaten_piece)
+            state.add(piece_position[0], piece_position[1], piece)
+
+    # (beaten, landing) pairs of a single jump, reversed so that popping them keeps the order of the directions
+    @staticmethod
+    def _jumps(piece, piece_position, state: State, geometry):
+        jumps = []
+        if isinstance(piece, King):
+            for direction in DIRECTIONS:
+                ray = geometry.rays[piece_position, direction]
+                for i, target_position in enumerate(ray):
+                    if not state.is_occupied(*target_position):
+                        continue
+                    if state.get_color(*target_position) != piece.color:
+                        for final_position in ray[i + 1:]:
+                            if state.is_occupied(*final_position):
+                                break
+                            jumps.append((target_position, final_position))
+                    break
+        else:
+            for direction, target_position, final_position in geometry.jumps[piece_position]:
+                if state.is_occupied(*target_position) and state.get_color(*target_position) != piece.color \
+                        and not state.is_occupied(*final_position):
+                    jumps.append((target_position, final_position))
+        jumps.reverse()
+        return jumps
+
+    # moves of beat paths, with the beaten pieces read from the state they are played on
+    @staticmethod
+    def _moves_from_paths(state: State, paths):
+        moves = []
+        for path in paths:
+            captures = path[1::2]
+            moves.append(Move(path[::2], captures, tuple(state.get_piece(*square) for square in captures),
+                              GameStrategy._promotes(state.get_piece(*path[0]), path[-1], state.rows)))
+        return moves
+
+
+def calculate_all_moves(state: State, color):
+    '''Every legal move of color, only its beats when it has any'''
+    return GameStrategy._calculate_all_moves(state, color)
+
 
-                for sub_beat in sub_beats:
-                    if sub_beat.is_valid():
-                        next_state = sub_beat.execute()
+class SearchStopped(Exception):
+    '''Raised inside the search when the time budget ran out or the stop event got set'''
 
-                        beats += self._calculate_valid_beats(sub_beat.final_position, next_state, sub_beat)
-                        if previous_beat:
-                            previous_beat.next_beats.append(sub_beat)
-                        else:
-                            beats += sub_beat.to_list()
-        return beats
 
+class SearchGameStrategy(GameStrategy):
+    '''Strategy searching the game down to a horizon where its heuristic scores the positions. Past the horizon
+    the search goes on while the player to move has to beat, for at most quiescence_nodes nodes.'''
 
-class AlphaBetaGameStrategy(GameStrategy):
-    def __init__(self, color, heuristic=light_pieces_dark_pieces_difference_heuristic, depth=10):
+    def __init__(self, color, heuristic, stats=False, quiescence_nodes=0):
         super().__init__(color)
         self._heuristic = heuristic
+        # heuristics with evaluate_encodings() score all leaves below a node at once
+        self._batch_evaluation = hasattr(heuristic, 'evaluate_encodings')
+        # without stats the search only pays for checking that there are none
+        self._collect_stats = stats
+        self._stats = None
+        # nodes past a horizon node the quiescence search may still visit
+        self._quiescence_nodes = quiescence_nodes
+        self._quiescence_left = 0
+
+    @property
+    def stats(self):
+        '''SearchStats of the last move, None unless the strategy collects them'''
+        return self._stats
+
+    # every node the search visits is counted here
+    @abstractmethod
+    def _count_node(self):
+        pass
+
+    def _quiescence(self, state: State, color, alpha=-math.inf, beta=math.inf):
+        '''Value of a horizon node: its beats are searched until nobody has to beat, for at most quiescence_nodes
+        nodes, and the positions at the end of them are scored by the heuristic'''
+        self._quiescence_left = self._quiescence_nodes
+        value = self._quiesce(state, color, alpha, beta)
+        if self._stats is not None and self._quiescence_left <= 0:
+            self._stats.quiescence_exhausted += 1
+        return value
+
+    def _quiesce(self, state: State, color, alpha, beta):
+        beats = self._beats(state, color) if self._quiescence_left > 0 and not state.is_ending() else None
+        if not beats:
+            if self._stats is not None:
+                self._stats.leaves += 1
+            return self._heuristic(state)
+        return self._combine_beats(state, color, beats, alpha, beta)
+
+    # value of a single beat past the horizon
+    def _quiesce_beat(self, state: State, color, move, alpha, beta):
+        self._quiescence_left -= 1
+        self._count_node()
+        if self._stats is not None:
+            self._stats.quiescence_nodes += 1
+        self._apply(state, move)
+        value = self._quiesce(state, Color.opposite(color), alpha, beta)
+        self._undo(state, move)
+        return value
+
+    @abstractmethod
+    def _combine_beats(self, state: State, color, beats, alpha, beta):
+        '''Value of a node past the horizon from the values _quiesce_beat gives its beats'''
+        pass
+
+
+class AlphaBetaGameStrategy(SearchGameStrategy):
+    MAX_DEPTH = 64
+
+    def __init__(self, color, heuristic=light_pieces_dark_pieces_difference_heuristic, depth=10, tt_memory_mb=16,
+                 time_ms=None, move_ordering: MoveOrdering = None, aspiration_window=None, principal_variation=False,
+                 opening_book=None, tablebase=None, stats=False, quiescence_nodes=0):
+        super().__init__(color, heuristic, stats, quiescence_nodes)
+        # leaves that may have to be looked up in the tablebase are not scored in batches
+        self._batch_evaluation = self._batch_evaluation and tablebase is None
         self._depth = depth
+        self._transposition_table = TranspositionTable(tt_memory_mb) if tt_memory_mb else None
+        # with a time budget the search deepens iteratively up to depth and stops when the budget runs out
+        self._time_ms = time_ms
+        self._deadline = None
+        # the search also stops once this event (anything with is_set()) is set
+        self._stop_event = None
+        self._nodes = 0
+        # without a move ordering only the transposition table move is moved to the front
+        self._move_ordering = move_ordering
+        self._search_depth = depth
+        # iterations after the first search a window of this half width around the previous score first
+        self._aspiration_window = aspiration_window
+        # principal variation search probes every move but the first with a null window, which assumes the
+        # heuristic returns integers
+        self._principal_variation = principal_variation
+        # positions found in the opening book are played from it without searching
+        self._opening_book = opening_book
+        # nodes with few enough pieces take their exact value from the endgame tablebase
+        self._tablebase = tablebase
+
+    @property
+    def move_ordering(self):
+        return self._move_ordering
+
+    @property
+    def search_progress(self):
+        '''Depth of the running iteration and nodes visited for the current move, readable from another thread'''
+        return self._search_depth, self._nodes
+
+    @property
+    def stop_event(self):
+        return self._stop_event
+
+    @stop_event.setter
+    def stop_event(self, value):
+        self._stop_event = value
+
+    def _should_stop(self):
+        return (self._deadline is not None and time.monotonic() >= self._deadline) \
+               or (self._stop_event is not None and self._stop_event.is_set())
 
     def move(self, state: State):
-        # alpha for maximizer, beta for minimizer
-        alpha, beta = -math.inf, math.inf
-        best_move, best_value = None, -math.inf
+        self._nodes = 0
+        self._stats = SearchStats() if self._collect_stats else None
+        if self._transposition_table is not None:
+            self._transposition_table.new_search()
+        if self._move_ordering is not None:
+            self._move_ordering.new_search()
+
+        state = copy(state)
+        moves = self._calculate_all_moves(state, self._color)
+        if len(moves) <= 1:
+            return (moves[0] if moves else None), False
+        book_move = self._opening_book.move(state, self._color, moves) if self._opening_book is not None else None
+        if book_move is not None:
+            return book_move, False
+
+        start = time.perf_counter()
+        if self._time_ms is None:
+            best_move, best_value = self._search_root(state, moves, self._depth)
+            if self._stats is not None:
+                self._stats.iterations.append((self._depth, self._nodes, time.perf_counter() - start))
+        else:
+            best_move = self._deepen(state, moves)
+
+        if self._move_ordering is not None:
+            logging.debug('First move cutoff rate: {:.2f}'.format(self._move_ordering.first_move_cutoff_rate))
+        if self._stats is not None:
+            self._stats.nodes = self._nodes
+            self._stats.seconds = time.perf_counter() - start
+            logging.debug('Search: {}'.format(self._stats.to_json()))
+        return best_move, False
 
-        for move in self._calculate_all_moves(state, self._color):
-            initial_state = move[-1].execute()
-            value = self.alpha_beta(initial_state, Color.opposite(self._color), alpha, beta, self._depth - 1)
-            if value > best_value:
+    def _deepen(self, state: State, moves):
+        deadline = time.monotonic() + self._time_ms / 1000
+        best_move, best_value = None, None
+        for depth in range(1, self._depth + 1):
+            # the first iteration always completes, so there is a move to return
+            self._deadline = deadline if best_move is not None else None
+            iteration_nodes, iteration_start = self._nodes, time.perf_counter()
+            try:
+                best_move, best_value = self._aspiration_search(state, moves, depth, best_value)
+            except SearchStopped:
+                break
+            finally:
+                self._deadline = None
+            if self._stats is not None:
+                self._stats.iterations.append((depth, self._nodes - iteration_nodes,
+                                               time.perf_counter() - iteration_start))
+            logging.debug('Depth: {}, Value: {}, Move: {}'.format(depth, best_value, best_move))
+
+            # the best move of this iteration is searched first in the next one
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+            if time.monotonic() >= deadline:
+                break
+        return best_move
+
+    def _aspiration_search(self, state: State, moves, depth, previous_value):
+        if self._aspiration_window and previous_value is not None:
+            alpha, beta = previous_value - self._aspiration_window, previous_value + self._aspiration_window
+            best_move, best_value = self._search_root(state, moves, depth, alpha, beta)
+            if alpha < best_value < beta:
+                return best_move, best_value
+            logging.debug('Aspiration window ({}, {}) failed with {}'.format(alpha, beta, best_value))
+        return self._search_root(state, moves, depth)
+
+    def _search_root(self, state: State, moves, depth, alpha=-math.inf, beta=math.inf):
+        # an interrupted search leaves its state half played, so it works on a copy of the root
+        state = copy(state)
+        self._search_depth = depth
+        best_move, best_value = None, -math.inf
+        for index, move in enumerate(moves):
+            self._apply(state, move)
+            # earlier root moves raise alpha for the later ones, a move that cannot beat them fails low
+            value = self._search_child(state, Color.opposite(self._color), max(alpha, best_value), beta, depth - 1,
+                                       True, index == 0)
+            self._undo(state, move)
+            # the first move is kept even when it loses, so there is a move to play when all of them do
+            if value > best_value or index == 0:
                 best_value, best_move = value, move
-        return best_move, False
+            if value >= beta:
+                break
+        return best_move, best_value
+
+    def _search_child(self, state, color, alpha, beta, depth, maximizing, first):
+        if first or not self._principal_variation:
+            return self.alpha_beta(state, color, alpha, beta, depth)
+
+        if maximizing and alpha != -math.inf:
+            value = self.alpha_beta(state, color, alpha, alpha + 1, depth)
+        elif not maximizing and beta != math.inf:
+            value = self.alpha_beta(state, color, beta - 1, beta, depth)
+        else:
+            return self.alpha_beta(state, color, alpha, beta, depth)
+
+        # the null window only tells whether the move is better, its exact value needs a full window
+        if alpha < value < beta:
+            value = self.alpha_beta(state, color, alpha, beta, depth)
+        return value
+
+    def _tablebase_value(self, state, color):
+        entry = self._tablebase.probe(state, color)
+        if entry is None:
+            return None
+        result, distance = entry
+        if result == DRAW:
+            return 0
+        # quicker wins and slower losses are better
+        value = WIN_VALUE - distance
+        return value if (result == WIN) == (color == self._color) else -value
+
+    # the moves of a node in the order they are searched, generated only as far as the search gets
+    def _ordered_moves(self, state, color, ply, table_move):
+        stages = self._move_stages(state, color, table_move)
+        if self._move_ordering is None:
+            for stage in stages:
+                yield from stage
+            return
+
+        # a table move gets searched before the other moves are generated and ordered
+        moves = next(stages, [])
+        if len(moves) == 1 and signature(moves[0]) == table_move:
+            yield moves[0]
+            moves = []
+        for stage in stages:
+            moves += stage
+        yield from self._move_ordering.order(moves, color, ply, table_move)
+
+    def _count_node(self):
+        # looking at the clock and the stop event on every node would cost more than the node itself
+        self._nodes += 1
+        if self._nodes & 0xFF == 0 and self._should_stop():
+            raise SearchStopped()
+
+    def alpha_beta(self, state, color: int, alpha, beta, depth):
+        self._count_node()
+        stats = self._stats
+
+        if self._tablebase is not None and state.light_pieces + state.dark_pieces <= self._tablebase.max_pieces:
+            value = self._tablebase_value(state, color)
+            if value is not None:
+                if stats is not None:
+                    stats.tablebase_hits += 1
+                return value
+
+        if depth == 0 and self._quiescence_nodes and not state.is_ending():
+            return self._quiescence(state, color, alpha, beta)
 
-    def alpha_beta(self, state, color: Tuple[int, int, int], alpha, beta, depth):
         if depth == 0 or state.is_ending():
+            if stats is not None:
+                stats.leaves += 1
             heuristic = self._heuristic(state)
             return heuristic
 
+        table = self._transposition_table
+        original_alpha, original_beta = alpha, beta
+        table_move = None
+        if table is not None:
+            key = state.key ^ Color.zobrist_key(color)
+            entry = table.probe(key)
+            if stats is not None:
+                stats.tt_probes += 1
+                stats.tt_hits += entry is not None
+            if entry is not None:
+                if entry.depth >= depth:
+                    if entry.bound == EXACT:
+                        return entry.value
+                    elif entry.bound == LOWER_BOUND:
+                        alpha = max(alpha, entry.value)
+                    else:
+                        beta = min(beta, entry.value)
+                    if beta <= alpha:
+                        return entry.value
+                table_move = entry.best_move
+
+        ply = self._search_depth - depth
+        moves = self._ordered_moves(state, color, ply, table_move)
+        leaf_values = None
+        if depth == 1 and self._batch_evaluation:
+            moves = list(moves)
+            if moves:
+                # leaves that are not quiet are searched on by the quiescence search
+                leaf_values = self._evaluate_leaves(state, moves, self._heuristic,
+                                                    Color.opposite(color) if self._quiescence_nodes else None)
+
+        best_move = None
         if color == self._color:
-            for move in self._calculate_all_moves(state, color):
-                next_state = move[-1].execute()
-                alpha = max(alpha, self.alpha_beta(next_state, Color.opposite(color), alpha, beta, depth - 1))
+            for index, move in enumerate(moves):
+                if leaf_values is not None and leaf_values[index] is not None:
+                    child_value = self._leaf_value(leaf_values[index])
+                else:
+                    self._apply(state, move)
+                    child_value = self._search_child(state, Color.opposite(color), alpha, beta, depth - 1, True,
+                                                     index == 0)
+                    self._undo(state, move)
+                if child_value > alpha:
+                    alpha, best_move = child_value, move
                 if beta <= alpha:
-                    return beta
-            return alpha
+                    value = beta
+                    break
+            else:
+                value = alpha
         else:
-            for move in self._calculate_all_moves(state, color):
-                next_state = move[-1].execute()
-                beta = min(beta, self.alpha_beta(next_state, Color.opposite(color), alpha, beta, depth - 1))
+            for index, move in enumerate(moves):
+                if leaf_values is not None and leaf_values[index] is not None:
+                    child_value = self._leaf_value(leaf_values[index])
+                else:
+                    self._apply(state, move)
+                    child_value = self._search_child(state, Color.opposite(color), alpha, beta, depth - 1, False,
+                                                     index == 0)
+                    self._undo(state, move)
+                if child_value < beta:
+                    beta, best_move = child_value, move
                 if beta <= alpha:
-                    return alpha
-            return beta
+                    value = alpha
+                    break
+            else:
+                value = beta
+
+        if beta <= alpha and self._move_ordering is not None:
+            self._move_ordering.record_cutoff(move, color, ply, depth, index)
+        if beta <= alpha and stats is not None:
+            stats.cutoffs += 1
+            stats.first_move_cutoffs += index == 0
+
+        if table is not None:
+            table.store(key, depth, value, TranspositionTable.bound(value, original_alpha, original_beta),
+                        signature(best_move) if best_move is not None else table_move)
+        return value
+
+    # a leaf scored in a batch still counts as a node of its own
+    def _leaf_value(self, value):
+        self._count_node()
+        if self._stats is not None:
+            self._stats.leaves += 1
+        return value
+
+    def _combine_beats(self, state: State, color, beats, alpha, beta):
+        maximizing = color == self._color
+        for move in beats:
+            value = self._quiesce_beat(state, color, move, alpha, beta)
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if beta <= alpha:
+                break
+        return alpha if maximizing else beta
 
 
 class ManualGameStrategy(GameStrategy):
@@ -129,22 +573,12 @@ class ManualGameStrategy(GameStrategy):
         self._next_beat_piece = None
 
     def move(self, state: State):
+        # only a human player needs pygame, engines and their worker processes never import it
+        import pygame
 
-        beats = []
-        for piece_position in state.piece_positions(self.color):
-            beats += self._calculate_valid_beats(piece_position, state)
-        if beats:
-            for beat in beats:
-                if isinstance(beat[-1], PawnBeat) and beat[-1].is_to_last_position():
-                    beat[-1].transform = True
-
-        moves = []
-        for piece_position in state.piece_positions(self.color):
-            moves += self._calculate_valid_moves(piece_position, state)
-        if moves:
-            for move in moves:
-                if isinstance(move[-1], PawnMove) and move[-1].is_to_last_position():
-                    move[-1].transform = True
+        # beats if there are any, the player plays them one step at a time
+        moves = self._calculate_all_moves(state, self.color)
+        beats = [move for move in moves if move.captures]
 
         while True:
             click_up = None
@@ -177,22 +611,16 @@ class ManualGameStrategy(GameStrategy):
             if beats:
                 current_beat = None
                 for b in beats:
-                    if b[0].piece_position == click_down and b[0].final_position == click_up:
-                        if current_beat is None or len(current_beat[0].next_beats) < len(b[0].next_beats):
+                    if b.squares[0] == click_down and b.squares[1] == click_up:
+                        if current_beat is None or len(current_beat.squares) < len(b.squares):
                             current_beat = b
 
                 if current_beat is None:
                     continue
 
-                piece = state.get_piece(*click_down)
-                beat_to_return = None
-                if isinstance(piece, King):
-                    beat_to_return = KingBeat(state, current_beat[0].piece_position, current_beat[0].target_position, current_beat[0].final_position)
-                else:
-                    beat_to_return = PawnBeat(state, current_beat[0].piece_position, current_beat[0].target_position)
-
-                if len(current_beat[0].next_beats) > 0:
-                    self._next_beat_piece = current_beat[0].final_position
+                beat_to_return = current_beat.steps(state)[0]
+                if len(current_beat.squares) > 2:
+                    self._next_beat_piece = current_beat.squares[1]
                     return [beat_to_return], True
                 else:
                     self._next_beat_piece = None
@@ -200,53 +628,95 @@ class ManualGameStrategy(GameStrategy):
 
             if moves and not beats:
                 for m in moves:
-                    if m[0].piece_position == click_down and m[0].target_position == click_up:
-                        return m, False
+                    if m.squares == (click_down, click_up):
+                        return m.steps(state), False
 
 
-class MinMaxGameStrategy(GameStrategy):
-    def __init__(self, color, heuristic=light_pieces_dark_pieces_difference_heuristic, depth=4):
-        super().__init__(color)
-        self._heuristic = heuristic
+class MinMaxGameStrategy(SearchGameStrategy):
+    def __init__(self, color, heuristic=light_pieces_dark_pieces_difference_heuristic, depth=4, stats=False,
+                 quiescence_nodes=0):
+        super().__init__(color, heuristic, stats, quiescence_nodes)
         self._depth = depth
 
     def move(self, state: State):
+        self._stats = SearchStats() if self._collect_stats else None
+        start = time.perf_counter()
         best_move, best_value = None, -math.inf
+        state = copy(state)
         for move in self._calculate_all_moves(state, self._color):
-            next_state = move[-1].execute()
-            value = self.min_max(next_state, Color.opposite(self._color), self._depth - 1)
+            self._apply(state, move)
+            value = self.min_max(state, Color.opposite(self._color), self._depth - 1)
+            self._undo(state, move)
             if value > best_value:
                 best_move, best_value = move, value
+        if self._stats is not None:
+            self._stats.seconds = time.perf_counter() - start
+            self._stats.iterations.append((self._depth, self._stats.nodes, self._stats.seconds))
+            logging.debug('Search: {}'.format(self._stats.to_json()))
         return best_move, False
 
-    def min_max(self, state: State, color: Tuple[int, int, int], depth: int):
+    def _count_node(self):
+        if self._stats is not None:
+            self._stats.nodes += 1
+
+    def min_max(self, state: State, color: int, depth: int):
+        self._count_node()
+        stats = self._stats
+        if depth == 0 and self._quiescence_nodes and not state.is_ending():
+            return self._quiescence(state, color)
+
         if depth == 0 or state.is_ending():
+            if stats is not None:
+                stats.leaves += 1
             return self._heuristic(state)
 
+        if depth == 1 and self._batch_evaluation:
+            moves = self._calculate_all_moves(state, color)
+            if moves:
+                opponent = Color.opposite(color)
+                values = self._evaluate_leaves(state, moves, self._heuristic,
+                                               opponent if self._quiescence_nodes else None)
+                if stats is not None:
+                    stats.nodes += sum(value is not None for value in values)
+                    stats.leaves += sum(value is not None for value in values)
+                for index, move in enumerate(moves):
+                    if values[index] is None:
+                        self._apply(state, move)
+                        values[index] = self.min_max(state, opponent, 0)
+                        self._undo(state, move)
+                return max(values) if color == self._color else min(values)
+
         if color == self._color:
             best_value = -math.inf
             for move in self._calculate_all_moves(state, color):
-                next_state = move[-1].execute()
-                value = self.min_max(next_state, Color.opposite(color), depth - 1)
+                self._apply(state, move)
+                value = self.min_max(state, Color.opposite(color), depth - 1)
+                self._undo(state, move)
                 best_value = max(best_value, value)
             return best_value
         else:
             best_value = math.inf
             for move in self._calculate_all_moves(state, color):
-                next_state = move[-1].execute()
-                value = self.min_max(next_state, Color.opposite(color), depth - 1)
+                self._apply(state, move)
+                value = self.min_max(state, Color.opposite(color), depth - 1)
+                self._undo(state, move)
                 best_value = min(best_value, value)
             return best_value
 
+    # without pruning the window stays the full one
+    def _combine_beats(self, state: State, color, beats, alpha, beta):
+        values = [self._quiesce_beat(state, color, move, alpha, beta) for move in beats]
+        return max(values) if color == self._color else min(values)
+
 
 class RandomGameStrategy(GameStrategy):
     def move(self, state: State):
-        beats = []
+        paths = []
         for piece in state.piece_positions(self._color):
-            beats += self._calculate_valid_beats(piece, state)
+            paths += self._capture_paths(piece, state)
 
-        if beats:
-            return random.choice(beats), False
+        if paths:
+            return self._moves_from_paths(state, [random.choice(paths)])[0], False
 
         moves = []
         for piece in state.piece_positions(self._color):
@@ -0,0 +1,219 @@
+import argparse
+import logging
+import mmap
+import struct
+import sys
+from array import array
+from collections import deque
+from copy import copy
+from itertools import combinations, product
+from math import comb
+
+from elements import Board, BitboardState, Color, State, Pawn, King
+
+UNKNOWN, DRAW, WIN, LOSS = range(4)
+
+# value of a won position for the winner, minus the plies it takes to win
+WIN_VALUE = 1000000
+
+
+class TablebaseIndex:
+    '''Numbers every position with up to max_pieces pieces on the playable squares of a rows x cols board.
+
+    Positions are grouped by material (light pawns, light kings, dark pawns, dark kings), inside a group the
+    squares of each kind are ranked as a combination and the player to move is the lowest digit. Slots of
+    overlapping pieces or pawns on their promotion row stay unused.'''
+
+    def __init__(self, rows, cols, max_pieces):
+        self.rows = rows
+        self.cols = cols
+        self.max_pieces = max_pieces
+        self.squares = [(x, y) for y in range(rows) for x in range(cols) if (x + y) % 2 == 1]
+        self.numbers = {square: number for number, square in enumerate(self.squares)}
+
+        self.offsets = {}
+        self.size = 0
+        count = len(self.squares)
+        for material in product(range(max_pieces + 1), repeat=4):
+            light_pawns, light_kings, dark_pawns, dark_kings = material
+            if light_pawns + light_kings == 0 or dark_pawns + dark_kings == 0 or sum(material) > max_pieces:
+                continue
+            self.offsets[material] = self.size
+            self.size += 2 * comb(count, light_pawns) * comb(count, light_kings) * comb(count, dark_pawns) \
+                * comb(count, dark_kings)
+
+    def index(self, state: State, color):
+        '''Slot of the position with color to move, None when it is not covered'''
+        if (state.rows, state.cols) != (self.rows, self.cols):
+            return None
+        kinds = ([], [], [], [])
+        for piece_color, kind in ((Color.LIGHT_PIECE, 0), (Color.DARK_PIECE, 2)):
+            for x, y in state.piece_positions(piece_color):
+                number = self.numbers.get((x, y))
+                if number is None:
+                    return None
+                kinds[kind + isinstance(state.get_piece(x, y), King)].append(number)
+
+        offset = self.offsets.get(tuple(len(numbers) for numbers in kinds))
+        if offset is None:
+            return None
+        index = 0
+        for numbers in kinds:
+            numbers.sort()
+            index = index * comb(len(self.squares), len(numbers)) \
+                + sum(comb(number, i + 1) for i, number in enumerate(numbers))
+        return offset + 2 * index + (color == Color.DARK_PIECE)
+
+    def positions(self, material):
+        '''Every legal placement of the material as (light pawn, light king, dark pawn, dark king) squares'''
+        light_pawn_squares = [square for square in self.squares if square[1] != 0]
+        dark_pawn_squares = [square for square in self.squares if square[1] != self.rows - 1]
+        for placement in product(combinations(light_pawn_squares, material[0]),
+                                 combinations(self.squares, material[1]),
+                                 combinations(dark_pawn_squares, material[2]),
+                                 combinations(self.squares, material[3])):
+            if len(set().union(*placement)) == sum(material):
+                yield placement
+
+
+class Tablebase:
+    '''Win, loss or draw and the plies to the end of the game for few-piece positions, read from a memory-mapped
+    file written by generate_tablebase.
+
+    The file is a header, the materials with their first slot and a 16-bit slot per position: the result in
+    the low two bits and the distance above them.'''
+
+    MAGIC = b'PCTB'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBBBBI')
+    MATERIAL = struct.Struct('<BBBBI')
+    SLOT = struct.Struct('<H')
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rows, cols, max_pieces, materials = Tablebase.HEADER.unpack_from(self._map)
+        if magic != Tablebase.MAGIC or version != Tablebase.VERSION:
+            self._map.close()
+            raise ValueError('Not a tablebase: {}'.format(path))
+        self.index = TablebaseIndex(rows, cols, max_pieces)
+        self._data_offset = Tablebase.HEADER.size + materials * Tablebase.MATERIAL.size
+
+    @property
+    def max_pieces(self):
+        return self.index.max_pieces
+
+    def close(self):
+        self._map.close()
+
+    def probe(self, state: State, color):
+        '''(result, distance) for color to move, None when the position is not in the tablebase'''
+        index = self.index.index(state, color)
+        if index is None:
+            return None
+        slot = Tablebase.SLOT.unpack_from(self._map, self._data_offset + 2 * index)[0]
+        if slot & 0x3 == UNKNOWN:
+            return None
+        return slot & 0x3, slot >> 2
+
+    @staticmethod
+    def write(path, index: TablebaseIndex, slots):
+        with open(path, 'wb') as f:
+            f.write(Tablebase.HEADER.pack(Tablebase.MAGIC, Tablebase.VERSION, index.rows, index.cols,
+                                          index.max_pieces, len(index.offsets)))
+            for material, offset in sorted(index.offsets.items(), key=lambda item: item[1]):
+                f.write(Tablebase.MATERIAL.pack(*material, offset))
+            if sys.byteorder == 'big':
+                slots = array('H', slots)
+                slots.byteswap()
+            f.write(slots.tobytes())
+
+
+def generate_tablebase(path, max_pieces, rows=Board.ROWS, cols=Board.COLS):
+    '''Solves every position with up to max_pieces pieces by retrograde analysis and writes the tablebase.
+
+    Positions without moves are lost and the ones that can take the last enemy piece are won, from there the
+    results spread to the predecessors breadth first: a position is won as soon as one move leads to a lost
+    one and lost once all of its moves lead to won ones. Whatever is left undecided is a draw.'''
+    # the move generation of the strategies is the reference for the rules, they import this module to probe it
+    from strategies import calculate_all_moves
+
+    index = TablebaseIndex(rows, cols, max_pieces)
+    slots = array('H', bytes(2 * index.size))
+    children = array('H', bytes(2 * index.size))
+    edge_sources, edge_targets = array('I'), array('I')
+    lost, won = [], []
+
+    for material in index.offsets:
+        for placement in index.positions(material):
+            state = BitboardState(rows, cols)
+            for squares, piece in zip(placement, (Pawn(Color.LIGHT_PIECE), King(Color.LIGHT_PIECE),
+                                                  Pawn(Color.DARK_PIECE), King(Color.DARK_PIECE))):
+                for x, y in squares:
+                    state.add(x, y, piece)
+
+            for color in (Color.LIGHT_PIECE, Color.DARK_PIECE):
+                node = index.index(state, color)
+                opponent = Color.opposite(color)
+                moves = calculate_all_moves(state, color)
+                if not moves:
+                    slots[node] = LOSS
+                    lost.append(node)
+                    continue
+
+                slots[node] = DRAW
+                for move in moves:
+                    child = copy(state)
+                    move.apply(child)
+                    # the player that just moved still has pieces, so the game ends with the opponent's last one
+                    if child.is_ending():
+                        slots[node] = WIN | 1 << 2
+                        won.append(node)
+                        break
+                    edge_sources.append(node)
+                    edge_targets.append(index.index(child, opponent))
+                    children[node] += 1
+        logging.info('Material: {}, Moves: {}'.format(material, len(edge_sources)))
+
+    # predecessors of every position, in the compressed row layout
+    starts = array('I', bytes(4 * (index.size + 1)))
+    for target in edge_targets:
+        starts[target + 1] += 1
+    for i in range(index.size):
+        starts[i + 1] += starts[i]
+    predecessors = array('I', bytes(4 * len(edge_targets)))
+    filled = array('I', starts)
+    for source, target in zip(edge_sources, edge_targets):
+        predecessors[filled[target]] = source
+        filled[target] += 1
+    del edge_sources, edge_targets, filled
+
+    # the queue holds decided positions by growing distance, losses in 0 plies come before wins in 1
+    queue = deque(lost + won)
+    while queue:
+        node = queue.popleft()
+        result, distance = slots[node] & 0x3, slots[node] >> 2
+        for predecessor in predecessors[starts[node]:starts[node + 1]]:
+            if slots[predecessor] & 0x3 != DRAW:
+                continue
+            if result == LOSS:
+                slots[predecessor] = WIN | (distance + 1) << 2
+                queue.append(predecessor)
+            else:
+                children[predecessor] -= 1
+                if children[predecessor] == 0:
+                    slots[predecessor] = LOSS | (distance + 1) << 2
+                    queue.append(predecessor)
+
+    Tablebase.write(path, index, slots)
+    return index.size
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generates an endgame tablebase by retrograde analysis')
+    parser.add_argument('path', nargs='?', default='../tablebase.bin')
+    parser.add_argument('--pieces', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.basicConfig(format='[%(asctime)s][%(levelname)s] %(name)s: %(message)s', level=logging.INFO)
+    generate_tablebase(args.path, args.pieces)
@@ -0,0 +1,50 @@
+import threading
+
+from elements import State
+from strategies import SearchStopped
+
+
+class BackgroundMove:
+    '''Runs move() of a strategy on a daemon thread, so the caller keeps handling events while it thinks.
+
+    Strategies with a stop_event can be cancelled, any other one is simply abandoned.'''
+
+    def __init__(self, strategy, state: State):
+        self._strategy = strategy
+        self._result = None
+        self._done = threading.Event()
+        self._installed_stop_event = hasattr(strategy, 'stop_event') and strategy.stop_event is None
+        if self._installed_stop_event:
+            strategy.stop_event = threading.Event()
+        self._stop_event = getattr(strategy, 'stop_event', None)
+        self._thread = threading.Thread(target=self._run, args=(state,), daemon=True)
+        self._thread.start()
+
+    def _run(self, state):
+        try:
+            self._result = self._strategy.move(state)
+        except SearchStopped:
+            pass
+        finally:
+            if self._installed_stop_event:
+                self._strategy.stop_event = None
+            self._done.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def result(self):
+        '''What move() returned, None while it runs or when it was cancelled'''
+        return self._result
+
+    @property
+    def progress(self):
+        '''Depth and nodes of the running search, None for strategies that do not report them'''
+        return getattr(self._strategy, 'search_progress', None)
+
+    def cancel(self):
+        if self._stop_event is not None:
+            self._stop_event.set()
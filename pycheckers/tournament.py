@@ -0,0 +1,213 @@
+import argparse
+import json
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import yaml
+
+from config_read import read_player
+from elements import Board, Color
+from match import Match
+from strategies import RandomGameStrategy
+
+ROUND_ROBIN, GAUNTLET = 'round_robin', 'gauntlet'
+
+
+def player_config(config, color):
+    '''Player config with its heuristic turned to the given color, so one config can play both sides'''
+    config = dict(config)
+    heuristic = config.get('heuristic')
+    side = 'light' if color == Color.LIGHT_PIECE else 'dark'
+    if heuristic is not None and not heuristic.startswith(side):
+        config['heuristic'] = '_'.join({'light': 'dark', 'dark': 'light'}.get(word, word)
+                                       for word in heuristic.split('_'))
+    return config
+
+
+def schedule(names, mode=ROUND_ROBIN, games=2):
+    '''Pairings as (light, dark) names, every pair plays games games with colors swapped after each one.
+
+    In a gauntlet the first player meets all the others, in a round robin everybody meets everybody.'''
+    if mode == GAUNTLET:
+        pairs = [(names[0], opponent) for opponent in names[1:]]
+    elif mode == ROUND_ROBIN:
+        pairs = [(first, second) for i, first in enumerate(names) for second in names[i + 1:]]
+    else:
+        raise ValueError('Unknown tournament mode: {}'.format(mode))
+    return [(first, second) if game % 2 == 0 else (second, first) for first, second in pairs for game in range(games)]
+
+
+def opening_seed(seed, game, games=2):
+    '''Seed of the opening of the game-th game of a schedule with games games per pairing, the same for both games
+    of a pair inside a pairing and different for every other game'''
+    pairing, game_in_pairing = divmod(game, games)
+    return seed + pairing * ((games + 1) // 2) + game_in_pairing // 2
+
+
+def play_game(game, light, dark, light_config, dark_config, max_plies=200, opening_plies=0, seed=0):
+    '''Plays one game and returns its record as a dict ready to be written as a JSON line'''
+    random.seed(seed)
+    board = Board()
+    board.prepare_pieces()
+    state = board.state
+
+    # a few random plies, the same for both games of a pair, keep deterministic players from repeating one game
+    color = Color.LIGHT_PIECE
+    for _ in range(opening_plies):
+        result = RandomGameStrategy(color).move(state)
+        if not result:
+            break
+        result[0].apply(state)
+        color = Color.opposite(color)
+
+    players = [read_player('player', Color.LIGHT_PIECE, {'player': player_config(light_config, Color.LIGHT_PIECE)}),
+               read_player('player', Color.DARK_PIECE, {'player': player_config(dark_config, Color.DARK_PIECE)})]
+    try:
+        record = Match(*players, max_plies=max_plies, state=state, color=color).play()
+    finally:
+        for player in players:
+            if hasattr(player, 'close'):
+                player.close()
+
+    names = {Color.LIGHT_PIECE: light, Color.DARK_PIECE: dark}
+    result = record.to_dict()
+    result.update({
+        'game': game,
+        'light': light,
+        'dark': dark,
+        'winner': names[record.winner] if record.winner is not None else None,
+        'light_moves': sum(1 for color, _, _ in record.moves if color == Color.LIGHT_PIECE),
+        'dark_moves': sum(1 for color, _, _ in record.moves if color == Color.DARK_PIECE),
+        'light_mean_move_time': record.mean_move_time(Color.LIGHT_PIECE),
+        'dark_mean_move_time': record.mean_move_time(Color.DARK_PIECE)
+    })
+    return result
+
+
+class PlayerStats:
+    def __init__(self, name):
+        self.name = name
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.moves = 0
+        self.move_time = 0.0
+
+    @property
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self):
+        return (self.wins + self.draws / 2) / self.games if self.games else 0.5
+
+    @property
+    def mean_move_time(self):
+        return self.move_time / self.moves if self.moves else 0.0
+
+    def elo(self, z=1.96):
+        '''Elo difference to the opponents met, with the bounds of its confidence interval (95% by default)'''
+        if not self.games:
+            return 0.0, -math.inf, math.inf
+        score = self.score
+        deviation = math.sqrt((self.wins * (1 - score) ** 2 + self.draws * (0.5 - score) ** 2
+                               + self.losses * score ** 2) / self.games / self.games)
+        return elo_difference(score), elo_difference(score - z * deviation), elo_difference(score + z * deviation)
+
+    def to_dict(self):
+        elo, elo_low, elo_high = self.elo()
+        return {
+            'name': self.name,
+            'games': self.games,
+            'wins': self.wins,
+            'draws': self.draws,
+            'losses': self.losses,
+            'score': self.score,
+            'elo': elo,
+            'elo_low': elo_low,
+            'elo_high': elo_high,
+            'mean_move_time': self.mean_move_time
+        }
+
+
+def elo_difference(score):
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1)
+
+
+def standings(results, names):
+    stats = {name: PlayerStats(name) for name in names}
+    for result in results:
+        for side in ('light', 'dark'):
+            player = stats[result[side]]
+            if result['winner'] is None:
+                player.draws += 1
+            elif result['winner'] == result[side]:
+                player.wins += 1
+            else:
+                player.losses += 1
+            player.moves += result[side + '_moves']
+            player.move_time += result[side + '_moves'] * result[side + '_mean_move_time']
+    return sorted(stats.values(), key=lambda player: player.score, reverse=True)
+
+
+class Tournament:
+    '''Plays the games between the configured players over a pool of worker processes.
+
+    Every finished game is appended to the results file as a JSON line as soon as it is done.'''
+
+    def __init__(self, players, mode=ROUND_ROBIN, games=2, workers=None, max_plies=200, opening_plies=0, seed=0):
+        self._players = {player['name']: player for player in players}
+        self._names = [player['name'] for player in players]
+        self._mode = mode
+        self._games = games
+        self._workers = workers
+        self._max_plies = max_plies
+        self._opening_plies = opening_plies
+        self._seed = seed
+
+    @staticmethod
+    def from_config(path):
+        with open(path, 'r') as f:
+            config = yaml.safe_load(f)
+        return Tournament(config['players'], config.get('mode', ROUND_ROBIN), int(config.get('games', 2)),
+                          config.get('workers'), int(config.get('max_plies', 200)),
+                          int(config.get('opening_plies', 0)), int(config.get('seed', 0)))
+
+    def play(self, results_path):
+        results = []
+        with ProcessPoolExecutor(self._workers) as executor, open(results_path, 'w') as results_file:
+            futures = []
+            for game, (light, dark) in enumerate(schedule(self._names, self._mode, self._games)):
+                futures.append(executor.submit(play_game, game, light, dark, self._players[light],
+                                               self._players[dark], self._max_plies, self._opening_plies,
+                                               opening_seed(self._seed, game, self._games)))
+            for future in as_completed(futures):
+                result = future.result()
+                results_file.write(json.dumps(result) + '\n')
+                results_file.flush()
+                results.append(result)
+        return standings(results, self._names)
+
+
+def print_standings(players):
+    print('{:<20} {:>6} {:>5} {:>5} {:>5} {:>7} {:>18} {:>10}'.format(
+        'player', 'games', 'wins', 'draws', 'losses', 'score', 'elo (95%)', 'ms/move'))
+    for player in players:
+        elo, elo_low, elo_high = player.elo()
+        print('{:<20} {:>6} {:>5} {:>5} {:>5} {:>7.3f} {:>6.0f} [{:.0f}, {:.0f}] {:>10.1f}'.format(
+            player.name, player.games, player.wins, player.draws, player.losses, player.score, elo, elo_low, elo_high,
+            1000 * player.mean_move_time))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Plays a tournament between strategies')
+    parser.add_argument('config', nargs='?', default='../tournament_config.yaml')
+    parser.add_argument('results', nargs='?', default='tournament_results.jsonl')
+    args = parser.parse_args()
+
+    print_standings(Tournament.from_config(args.config).play(args.results))
@@ -0,0 +1,127 @@
+import multiprocessing
+import struct
+
+EXACT, LOWER_BOUND, UPPER_BOUND = range(3)
+
+
+class TranspositionEntry:
+    __slots__ = ('key', 'depth', 'value', 'bound', 'best_move', 'generation')
+
+    def __init__(self, key, depth, value, bound, best_move, generation):
+        self.key = key
+        self.depth = depth
+        self.value = value
+        self.bound = bound
+        self.best_move = best_move
+        self.generation = generation
+
+
+class TranspositionTable:
+    '''Fixed-size table of search results indexed by Zobrist key'''
+
+    # rough size of an entry with its key, value and best move signature, in bytes
+    ENTRY_SIZE = 256
+
+    def __init__(self, memory_mb=16):
+        self.size = max(1, int(memory_mb * 1024 * 1024) // TranspositionTable.ENTRY_SIZE)
+        self._entries = [None] * self.size
+        self._generation = 0
+
+    def new_search(self):
+        self._generation += 1
+
+    def clear(self):
+        self._entries = [None] * self.size
+        self._generation = 0
+
+    def probe(self, key):
+        entry = self._entries[key % self.size]
+        if entry is not None and entry.key == key:
+            return entry
+        return None
+
+    # depth-preferred replacement: a slot filled during the current search is only taken over by an
+    # equally deep or deeper result, slots left over from earlier searches are always replaced
+    def store(self, key, depth, value, bound, best_move):
+        index = key % self.size
+        entry = self._entries[index]
+        if entry is not None and entry.generation == self._generation and entry.key != key and entry.depth > depth:
+            return
+        self._entries[index] = TranspositionEntry(key, depth, value, bound, best_move, self._generation)
+
+    @staticmethod
+    def bound(value, alpha, beta):
+        if value <= alpha:
+            return UPPER_BOUND
+        elif value >= beta:
+            return LOWER_BOUND
+        return EXACT
+
+
+class SharedTranspositionTable:
+    '''Transposition table in shared memory, usable by several processes at once.
+
+    Every slot is two 64-bit words: the key xor-ed with the data and the data itself. Writes are not locked,
+    a slot torn by two processes writing at once no longer matches its key and reads as a miss. The data packs
+    the value as a 32-bit float, depth, bound, generation and the first and last square of the best move, so
+    only moves made of a single step keep their full signature.'''
+
+    # two 64-bit words
+    ENTRY_SIZE = 16
+
+    def __init__(self, memory_mb=16, cols=8, array=None):
+        self.size = max(1, int(memory_mb * 1024 * 1024) // SharedTranspositionTable.ENTRY_SIZE)
+        self.cols = cols
+        self._array = array if array is not None else multiprocessing.RawArray('Q', 2 * self.size)
+        self._generation = 0
+
+    def __getstate__(self):
+        return self.size, self.cols, self._array, self._generation
+
+    def __setstate__(self, state):
+        self.size, self.cols, self._array, self._generation = state
+
+    def new_search(self):
+        self._generation = (self._generation + 1) & 0x1F
+
+    def clear(self):
+        for i in range(2 * self.size):
+            self._array[i] = 0
+        self._generation = 0
+
+    def probe(self, key):
+        index = 2 * (key % self.size)
+        data = self._array[index + 1]
+        if data == 0 or self._array[index] ^ data != key:
+            return None
+        return self._unpack(key, data)
+
+    def store(self, key, depth, value, bound, best_move):
+        index = 2 * (key % self.size)
+        data = self._array[index + 1]
+        if data != 0 and self._array[index] ^ data != key:
+            entry = self._unpack(self._array[index] ^ data, data)
+            if entry.generation == self._generation and entry.depth > depth:
+                return
+        data = self._pack(depth, value, bound, best_move)
+        self._array[index] = key ^ data
+        self._array[index + 1] = data
+
+    def _pack(self, depth, value, bound, best_move):
+        origin, destination = 0, 0
+        if best_move is not None:
+            origin = best_move[0][1] * self.cols + best_move[0][0] + 1
+            destination = best_move[-1][1] * self.cols + best_move[-1][0] + 1
+        value_bits = struct.unpack('<I', struct.pack('<f', value))[0]
+        return value_bits << 32 | min(depth, 0x7F) << 25 | bound << 23 | self._generation << 18 \
+            | origin << 9 | destination
+
+    def _unpack(self, key, data):
+        value = struct.unpack('<f', struct.pack('<I', data >> 32))[0]
+        if value.is_integer():
+            value = int(value)
+        origin, destination = data >> 9 & 0x1FF, data & 0x1FF
+        best_move = None
+        if origin:
+            best_move = (divmod(origin - 1, self.cols)[::-1], divmod(destination - 1, self.cols)[::-1])
+        return TranspositionEntry(key, data >> 25 & 0x7F, value, data >> 23 & 0x3, best_move, data >> 18 & 0x1F)
@@ -0,0 +1,10 @@
+import random
+
+MAX_SQUARES = 256
+
+# fixed seed, so the same position gets the same key in every process and every run
+_random = random.Random(0x2F6B1C3D)
+
+# PIECE_KEYS[square_index][piece code]
+PIECE_KEYS = [tuple(_random.getrandbits(64) for _ in range(4)) for _ in range(MAX_SQUARES)]
+DARK_TO_MOVE_KEY = _random.getrandbits(64)
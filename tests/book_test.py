@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+from book import OpeningBook, build_book
+from elements import Color, Board, State, Pawn
+from heuristics import light_pieces_maximizing_heuristic, dark_pieces_maximizing_heuristic
+from moves import signature
+from strategies import AlphaBetaGameStrategy, GameStrategy
+
+
+class OpeningBookTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'book.bin')
+        board = Board()
+        board.prepare_pieces()
+        self.state = board.state
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def build(self, plies):
+        return build_book(self.path, AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 3),
+                          AlphaBetaGameStrategy(Color.DARK_PIECE, dark_pieces_maximizing_heuristic, 3), plies)
+
+    def test_build_and_probe(self):
+        # given
+        positions = self.build(2)
+        strategy = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 3)
+        expected_move, _ = strategy.move(self.state)
+
+        # when
+        book = OpeningBook(self.path)
+        moves = strategy._calculate_all_moves(self.state, Color.LIGHT_PIECE)
+        book_move = book.move(self.state, Color.LIGHT_PIECE, moves)
+
+        # then
+        self.assertEqual(8, positions)
+        self.assertEqual(8, len(book))
+        self.assertEqual(signature(expected_move), signature(book_move))
+        self.assertIsNone(book.probe(self.state, Color.DARK_PIECE))
+        for move in moves:
+            GameStrategy._apply(self.state, move)
+            self.assertIsNotNone(book.probe(self.state, Color.DARK_PIECE))
+            GameStrategy._undo(self.state, move)
+        book.close()
+
+    def test_strategy_plays_book_move_without_searching(self):
+        # given
+        self.build(1)
+        book = OpeningBook(self.path)
+        strategy = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 3, opening_book=book)
+        other_state = State(8, 8)
+        other_state.add(2, 5, Pawn(Color.LIGHT_PIECE))
+        other_state.add(4, 5, Pawn(Color.LIGHT_PIECE))
+        other_state.add(5, 2, Pawn(Color.DARK_PIECE))
+
+        # when
+        book_move, _ = strategy.move(self.state)
+        book_nodes = strategy.search_progress[1]
+        strategy.move(other_state)
+        searched_nodes = strategy.search_progress[1]
+
+        # then
+        self.assertIsNotNone(book_move)
+        self.assertEqual(0, book_nodes)
+        self.assertGreater(searched_nodes, 0)
+        book.close()
+
+    def test_not_a_book(self):
+        # given
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 64)
+
+        # then
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from copy import copy, deepcopy
 
-from elements import State, Pawn, Color
+from elements import State, BitboardState, Pawn, King, Color, PIECES, LIGHT_PAWN, LIGHT_KING, DARK_PAWN, DARK_KING
 
 
 class StateTestCase(unittest.TestCase):
@@ -26,10 +26,111 @@ class StateTestCase(unittest.TestCase):
 
         # when
         state_b = deepcopy(state_a)
+        state_b.remove(0, 0)
 
         # then
-        self.assertFalse(state_a.get_piece(0, 0) is state_b.get_piece(0, 0))
-        self.assertFalse(state_a.get_piece(2, 2) is state_b.get_piece(2, 2))
+        self.assertTrue(state_a.get_piece(0, 0))
+        self.assertFalse(state_b.get_piece(0, 0))
+        # pieces are interned, a copy shares them
+        self.assertTrue(state_a.get_piece(2, 2) is state_b.get_piece(2, 2))
+
+
+class BitboardStateTestCase(unittest.TestCase):
+    def test_same_positions_as_state(self):
+        # given
+        state = State(5, 5)
+        state.add(1, 0, Pawn(Color.DARK_PIECE))
+        state.add(3, 0, King(Color.DARK_PIECE))
+        state.add(0, 3, Pawn(Color.LIGHT_PIECE))
+        state.add(4, 4, Pawn(Color.LIGHT_PIECE))
+
+        # when
+        bitboard_state = BitboardState.from_state(state)
+
+        # then
+        for color in [Color.LIGHT_PIECE, Color.DARK_PIECE]:
+            self.assertEqual(state.piece_positions(color), bitboard_state.piece_positions(color))
+        self.assertTrue(isinstance(bitboard_state.get_piece(3, 0), King))
+        self.assertFalse(isinstance(bitboard_state.get_piece(1, 0), King))
+        self.assertEqual(Color.LIGHT_PIECE, bitboard_state.get_color(4, 4))
+        self.assertFalse(bitboard_state.is_occupied(2, 2))
+
+    def test_copy(self):
+        # given
+        state_a = BitboardState(3, 3)
+        state_a.add(0, 0, Pawn(Color.LIGHT_PIECE))
+        state_a.add(2, 2, Pawn(Color.DARK_PIECE))
+
+        # when
+        state_b = copy(state_a)
+        state_b.remove(0, 0)
+        state_b.transform_into_king(2, 2)
+
+        # then
+        self.assertTrue(state_a.is_occupied(0, 0))
+        self.assertFalse(isinstance(state_a.get_piece(2, 2), King))
+        self.assertFalse(state_b.is_occupied(0, 0))
+        self.assertTrue(isinstance(state_b.get_piece(2, 2), King))
+
+    def test_is_ending(self):
+        # given
+        state = BitboardState(3, 3)
+        state.add(0, 0, Pawn(Color.LIGHT_PIECE))
+        state.add(2, 2, King(Color.DARK_PIECE))
+
+        # when
+        state.remove(2, 2)
+
+        # then
+        self.assertTrue(state.is_ending())
+        self.assertEqual(1, state.light_pieces)
+        self.assertEqual(0, state.dark_pieces)
+        self.assertFalse(state.is_occupied(2, 2))
+
+    def test_zobrist_key(self):
+        # given
+        state = State(3, 3)
+        state.add(0, 0, Pawn(Color.LIGHT_PIECE))
+        state.add(2, 2, Pawn(Color.DARK_PIECE))
+        bitboard_state = BitboardState.from_state(state)
+
+        # when
+        for s in (state, bitboard_state):
+            s.remove(2, 2)
+            s.add(2, 0, Pawn(Color.DARK_PIECE))
+            s.transform_into_king(0, 0)
+        expected = BitboardState(3, 3)
+        expected.add(0, 0, King(Color.LIGHT_PIECE))
+        expected.add(2, 0, Pawn(Color.DARK_PIECE))
+
+        # then
+        self.assertEqual(expected.key, state.key)
+        self.assertEqual(expected.key, bitboard_state.key)
+        self.assertNotEqual(0, expected.key)
+
+
+class PieceTestCase(unittest.TestCase):
+    def test_interned(self):
+        # when
+        pieces = [Pawn(Color.LIGHT_PIECE), King(Color.LIGHT_PIECE), Pawn(Color.DARK_PIECE), King(Color.DARK_PIECE)]
+
+        # then
+        self.assertTrue(all(piece is PIECES[piece.code] for piece in pieces))
+        self.assertTrue(Pawn(Color.DARK_PIECE) is pieces[2])
+        self.assertTrue(deepcopy(pieces[3]) is pieces[3])
+        self.assertEqual([LIGHT_PAWN, LIGHT_KING, DARK_PAWN, DARK_KING], [piece.code for piece in pieces])
+
+    def test_transform_into_king(self):
+        # given
+        state = State(3, 3)
+        state.add(1, 0, Pawn(Color.LIGHT_PIECE))
+
+        # when
+        state.transform_into_king(1, 0)
+
+        # then
+        self.assertTrue(state.get_piece(1, 0) is King(Color.LIGHT_PIECE))
+        self.assertEqual(1, state.light_kings)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,77 @@
+import unittest
+
+from elements import Color, State, BitboardState, Board, Pawn, King, LIGHT_PAWN, DARK_KING
+from evaluation import encode_states, maximizing_evaluator, piece_square_evaluator, EMPTY
+from heuristics import light_pieces_maximizing_heuristic, dark_pieces_maximizing_heuristic
+from moves import signature
+from strategies import MinMaxGameStrategy, AlphaBetaGameStrategy
+
+
+class EncodingTestCase(unittest.TestCase):
+    def test_encode_states(self):
+        # given
+        state_a = State(3, 3)
+        state_a.add(0, 0, Pawn(Color.LIGHT_PIECE))
+        state_b = BitboardState(3, 3)
+        state_b.add(2, 1, King(Color.DARK_PIECE))
+
+        # when
+        codes = encode_states([state_a, state_b])
+
+        # then
+        self.assertEqual((2, 9), codes.shape)
+        self.assertEqual([LIGHT_PAWN + 1] + [EMPTY] * 8, codes[0].tolist())
+        self.assertEqual(DARK_KING + 1, codes[1][5])
+
+
+class PieceSquareEvaluatorTestCase(unittest.TestCase):
+    def test_same_values_as_maximizing_heuristics(self):
+        # given
+        board = Board()
+        board.prepare_pieces()
+        state = board.state
+        state.remove(1, 0)
+        state.transform_into_king(0, 5)
+        states = [board.state, state]
+
+        # when
+        light_values = maximizing_evaluator(Color.LIGHT_PIECE).evaluate(encode_states(states))
+        dark_values = maximizing_evaluator(Color.DARK_PIECE).evaluate(encode_states(states))
+
+        # then
+        self.assertEqual([light_pieces_maximizing_heuristic(s) for s in states], light_values)
+        self.assertEqual([dark_pieces_maximizing_heuristic(s) for s in states], dark_values)
+
+    def test_single_state(self):
+        # given
+        board = Board()
+        board.prepare_pieces()
+        evaluator = piece_square_evaluator(Color.DARK_PIECE)
+
+        # when
+        value = evaluator(board.state)
+
+        # then
+        self.assertEqual(0, value)
+
+    def test_batched_search(self):
+        # given
+        board = Board()
+        board.prepare_pieces()
+        strategies = [strategy_type(Color.LIGHT_PIECE, heuristic, depth, stats=True)
+                      for strategy_type, depth in [(MinMaxGameStrategy, 3), (AlphaBetaGameStrategy, 4)]
+                      for heuristic in [light_pieces_maximizing_heuristic, maximizing_evaluator(Color.LIGHT_PIECE)]]
+
+        # when
+        moves = [signature(strategy.move(board.state)[0]) for strategy in strategies]
+        counts = [(strategy.stats.nodes, strategy.stats.leaves) for strategy in strategies]
+
+        # then
+        self.assertEqual(moves[0], moves[1])
+        self.assertEqual(moves[2], moves[3])
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(counts[2], counts[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from geometry import board_geometry
+
+
+class GeometryTestCase(unittest.TestCase):
+    def test_rays(self):
+        # given
+        geometry = board_geometry(5, 5)
+
+        # when
+        ray = geometry.rays[(1, 1), (1, 1)]
+
+        # then
+        self.assertEqual(((2, 2), (3, 3), (4, 4)), ray)
+        self.assertEqual((), geometry.rays[(0, 0), (-1, 1)])
+
+    def test_neighbours_and_jumps(self):
+        # given
+        geometry = board_geometry(5, 5)
+
+        # when
+        neighbours = [square for direction, square in geometry.neighbours[0, 1]]
+        jumps = [(target, final) for direction, target, final in geometry.jumps[0, 1]]
+
+        # then
+        self.assertEqual([(1, 2), (1, 0)], neighbours)
+        self.assertEqual([((1, 2), (2, 3))], jumps)
+
+    def test_path(self):
+        # given
+        geometry = board_geometry(5, 5)
+
+        # when
+        path_excluding_aim = geometry.path((4, 0), (1, 3), False)
+        path_including_aim = geometry.path((4, 0), (1, 3), True)
+
+        # then
+        self.assertEqual([(3, 1), (2, 2)], path_excluding_aim)
+        self.assertEqual([(3, 1), (2, 2), (1, 3)], path_including_aim)
+
+    def test_geometry_is_shared_per_size(self):
+        self.assertTrue(board_geometry(8, 8) is board_geometry(8, 8))
+        self.assertFalse(board_geometry(8, 8) is board_geometry(5, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
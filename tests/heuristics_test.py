@@ -0,0 +1,72 @@
+import random
+import unittest
+
+from elements import Color, State, BitboardState, Board, Pawn, King
+from heuristics import light_pieces_dark_pieces_difference_heuristic, dark_pieces_light_pieces_difference_heuristic, \
+    light_pieces_maximizing_heuristic, dark_pieces_maximizing_heuristic
+from strategies import RandomGameStrategy
+
+
+def scanned_difference(state, color):
+    return len(state.piece_positions(color)) - len(state.piece_positions(Color.opposite(color)))
+
+
+def scanned_distance(state, color):
+    if color == Color.LIGHT_PIECE:
+        return sum(Board.ROWS - 1 - y for x, y in state.piece_positions(color))
+    return sum(y for x, y in state.piece_positions(color))
+
+
+class IncrementalHeuristicsTestCase(unittest.TestCase):
+    def assert_same_as_scan(self, state):
+        self.assertEqual(scanned_difference(state, Color.LIGHT_PIECE),
+                         light_pieces_dark_pieces_difference_heuristic(state))
+        self.assertEqual(scanned_difference(state, Color.DARK_PIECE),
+                         dark_pieces_light_pieces_difference_heuristic(state))
+        self.assertEqual(10 * scanned_difference(state, Color.LIGHT_PIECE) + scanned_distance(state, Color.LIGHT_PIECE),
+                         light_pieces_maximizing_heuristic(state))
+        self.assertEqual(10 * scanned_difference(state, Color.DARK_PIECE) + scanned_distance(state, Color.DARK_PIECE),
+                         dark_pieces_maximizing_heuristic(state))
+
+    def test_random_games(self):
+        for state_type, size in [(State, 8), (BitboardState, 8), (State, 6), (BitboardState, 5)]:
+            # given
+            random.seed(size)
+            state = state_type(size, size)
+            for y in range(size):
+                for x in range(size):
+                    if (x + y) % 2 == 1 and y < 2:
+                        state.add(x, y, Pawn(Color.DARK_PIECE))
+                    elif (x + y) % 2 == 1 and y >= size - 2:
+                        state.add(x, y, Pawn(Color.LIGHT_PIECE))
+            players = [RandomGameStrategy(Color.LIGHT_PIECE), RandomGameStrategy(Color.DARK_PIECE)]
+
+            for turn in range(80):
+                # when
+                result = players[turn % 2].move(state)
+                if not result:
+                    break
+                move, is_next_beat = result
+                move.apply(state)
+
+                # then
+                self.assert_same_as_scan(state)
+                self.assertEqual(len([1 for position in state.piece_positions(Color.LIGHT_PIECE)
+                                      if isinstance(state.get_piece(*position), King)]), state.light_kings)
+
+    def test_decoded_state(self):
+        # given
+        state = BitboardState(8, 8)
+        state.add(1, 2, King(Color.DARK_PIECE))
+        state.add(2, 7, Pawn(Color.LIGHT_PIECE))
+
+        # when
+        decoded = BitboardState.decode(state.encode())
+
+        # then
+        self.assert_same_as_scan(decoded)
+        self.assertEqual(1, decoded.dark_kings)
+
+
+if __name__ == '__main__':
+    unittest.main()
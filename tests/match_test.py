@@ -0,0 +1,92 @@
+import random
+import unittest
+
+from elements import Color, BitboardState, Board, King
+from heuristics import light_pieces_dark_pieces_difference_heuristic, dark_pieces_light_pieces_difference_heuristic
+from match import Match
+from moves import signature
+from strategies import GameStrategy, RandomGameStrategy, AlphaBetaGameStrategy
+
+
+class FirstMoveGameStrategy(GameStrategy):
+    def move(self, state):
+        moves = self._calculate_all_moves(state, self._color)
+        return (moves[0] if moves else None), False
+
+
+class ShuttleGameStrategy(GameStrategy):
+    def __init__(self, color, squares):
+        super().__init__(color)
+        self._squares = squares
+
+    def move(self, state):
+        moves = self._calculate_all_moves(state, self._color)
+        return next(move for move in moves if signature(move)[-1] in self._squares), False
+
+
+class MatchTestCase(unittest.TestCase):
+    def test_random_games_end(self):
+        for seed in range(5):
+            # given
+            random.seed(seed)
+            match = Match(RandomGameStrategy(Color.LIGHT_PIECE), RandomGameStrategy(Color.DARK_PIECE), max_plies=100)
+
+            # when
+            record = match.play()
+
+            # then
+            self.assertIn(record.reason, [Match.NO_MOVES, Match.MOVE_LIMIT, Match.REPETITION])
+            self.assertLessEqual(record.plies, 100)
+            self.assertEqual(Color.LIGHT_PIECE, record.moves[0][0])
+            if record.reason == Match.NO_MOVES:
+                self.assertIsNotNone(record.winner)
+            else:
+                self.assertIsNone(record.winner)
+
+    def test_stronger_player_wins(self):
+        # given
+        match = Match(AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_dark_pieces_difference_heuristic, 4),
+                      FirstMoveGameStrategy(Color.DARK_PIECE))
+
+        # when
+        record = match.play()
+
+        # then
+        self.assertEqual(Color.LIGHT_PIECE, record.winner)
+        self.assertEqual(Match.NO_MOVES, record.reason)
+        self.assertEqual('White', record.to_dict()['winner'])
+
+    def test_repetition(self):
+        # given
+        state = BitboardState(Board.ROWS, Board.COLS)
+        state.add(0, 7, King(Color.LIGHT_PIECE))
+        state.add(7, 4, King(Color.DARK_PIECE))
+        match = Match(ShuttleGameStrategy(Color.LIGHT_PIECE, [(0, 7), (1, 6)]),
+                      ShuttleGameStrategy(Color.DARK_PIECE, [(7, 4), (6, 5)]), state=state)
+
+        # when
+        record = match.play()
+
+        # then
+        self.assertIsNone(record.winner)
+        self.assertEqual(Match.REPETITION, record.reason)
+        self.assertEqual(8, record.plies)
+
+    def test_move_limit(self):
+        # given
+        match = Match(AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_dark_pieces_difference_heuristic, 1),
+                      AlphaBetaGameStrategy(Color.DARK_PIECE, dark_pieces_light_pieces_difference_heuristic, 1),
+                      max_plies=10)
+
+        # when
+        record = match.play()
+
+        # then
+        self.assertEqual(Match.MOVE_LIMIT, record.reason)
+        self.assertEqual(10, record.plies)
+        self.assertEqual(10, len(record.to_dict()['moves']))
+        self.assertGreaterEqual(record.mean_move_time(Color.DARK_PIECE), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 
-from elements import State, Pawn, Color, King
-from moves import PawnMove, PawnBeat, KingMove, KingBeat
+from elements import State, BitboardState, Pawn, Color, King
+from moves import PawnMove, PawnBeat, KingMove, KingBeat, Move, signature
 
 
 class PawnMovesTestCase(unittest.TestCase):
@@ -262,6 +262,33 @@ class PawnMovesTestCase(unittest.TestCase):
         self.assertFalse(next_state_2.get_piece(*target_position_2))
         self.assertTrue(next_state_2.get_piece(*final_position_2))
 
+    def test_pawn_beat_apply_and_undo(self):
+        # given
+        state = State(3, 3)
+        state.add(0, 2, Pawn(Color.LIGHT_PIECE))
+        state.add(1, 1, Pawn(Color.DARK_PIECE))
+        beat = PawnBeat(state, (0, 2), (1, 1))
+        beat.transform = True
+
+        # when
+        record = beat.apply(state)
+
+        # then
+        self.assertFalse(isinstance(record.piece, King))
+        self.assertTrue(isinstance(state.get_piece(2, 0), King))
+        self.assertFalse(state.get_piece(1, 1))
+        self.assertEqual(0, state.dark_pieces)
+
+        # when
+        beat.undo(state)
+
+        # then
+        self.assertFalse(state.get_piece(2, 0))
+        self.assertFalse(isinstance(state.get_piece(0, 2), King))
+        self.assertEqual(Color.DARK_PIECE, state.get_color(1, 1))
+        self.assertEqual(1, state.dark_pieces)
+
+
 class KingMovesTestCase(unittest.TestCase):
     def test_king_move(self):
         # given
@@ -307,6 +334,63 @@ class KingMovesTestCase(unittest.TestCase):
             self.assertFalse(next_state.get_piece(*target_position))
             self.assertTrue(next_state.get_piece(*final_position))
 
+    def test_king_beat_apply_and_undo(self):
+        # given
+        state = BitboardState(5, 5)
+        state.add(0, 0, King(Color.DARK_PIECE))
+        state.add(2, 2, Pawn(Color.LIGHT_PIECE))
+        beat = KingBeat(state, (0, 0), (2, 2), (4, 4))
+
+        # when
+        beat.apply(state)
+        positions_after_apply = state.piece_positions(Color.DARK_PIECE), state.piece_positions(Color.LIGHT_PIECE)
+        beat.undo(state)
+
+        # then
+        self.assertEqual(([(4, 4)], []), positions_after_apply)
+        self.assertTrue(isinstance(state.get_piece(0, 0), King))
+        self.assertEqual(Color.LIGHT_PIECE, state.get_color(2, 2))
+        self.assertFalse(state.is_occupied(4, 4))
+
+
+class MoveTestCase(unittest.TestCase):
+    def setUp(self):
+        self.state = BitboardState(5, 5)
+        self.state.add(0, 4, Pawn(Color.DARK_PIECE))
+        self.state.add(1, 3, King(Color.LIGHT_PIECE))
+        self.state.add(3, 3, Pawn(Color.LIGHT_PIECE))
+        self.move = Move(((0, 4), (2, 2), (4, 4)), ((1, 3), (3, 3)),
+                         (King(Color.LIGHT_PIECE), Pawn(Color.LIGHT_PIECE)), promotion=True)
+
+    def test_apply_and_undo(self):
+        # given
+        key = self.state.key
+
+        # when
+        self.move.apply(self.state)
+        positions_after_apply = self.state.piece_positions(Color.DARK_PIECE), self.state.light_pieces
+        king_after_apply = isinstance(self.state.get_piece(4, 4), King)
+        self.move.undo(self.state)
+
+        # then
+        self.assertEqual(([(4, 4)], 0), positions_after_apply)
+        self.assertTrue(king_after_apply)
+        self.assertEqual(key, self.state.key)
+        self.assertFalse(isinstance(self.state.get_piece(0, 4), King))
+        self.assertTrue(isinstance(self.state.get_piece(1, 3), King))
+
+    def test_steps(self):
+        # when
+        steps = self.move.steps(self.state)
+        next_state = steps[-1].execute()
+
+        # then
+        self.assertEqual([PawnBeat, PawnBeat], [type(step) for step in steps])
+        self.assertEqual(signature(self.move), signature(steps))
+        self.assertEqual([steps[1]], steps[0].next_beats)
+        self.assertTrue(steps[-1].transform)
+        self.assertEqual(self.move.execute(self.state).key, next_state.key)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from elements import Color
+from moves import Move, signature
+from ordering import MoveOrdering
+
+
+class MoveOrderingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.moves = [Move(((1, 3), (0, 2))),
+                      Move(((1, 3), (2, 2))),
+                      Move(((3, 3), (4, 2)))]
+
+    def test_table_move_first(self):
+        # given
+        ordering = MoveOrdering()
+
+        # when
+        ordered = ordering.order(self.moves, Color.LIGHT_PIECE, 0, signature(self.moves[2]))
+
+        # then
+        self.assertTrue(ordered[0] is self.moves[2])
+        self.assertEqual([self.moves[0], self.moves[1]], ordered[1:])
+
+    def test_promotion_before_quiet_move(self):
+        # given
+        ordering = MoveOrdering()
+        self.moves[1] = Move(((1, 3), (2, 2)), promotion=True)
+
+        # when
+        ordered = ordering.order(self.moves, Color.LIGHT_PIECE, 0)
+
+        # then
+        self.assertTrue(ordered[0] is self.moves[1])
+
+    def test_killer_move(self):
+        # given
+        ordering = MoveOrdering()
+
+        # when
+        ordering.record_cutoff(self.moves[2], Color.LIGHT_PIECE, 3, 2, 2)
+        ordering.record_cutoff(self.moves[2], Color.LIGHT_PIECE, 3, 2, 0)
+        ordered_at_ply = ordering.order(self.moves, Color.LIGHT_PIECE, 3)
+
+        # then
+        self.assertTrue(ordered_at_ply[0] is self.moves[2])
+        self.assertEqual(0.5, ordering.first_move_cutoff_rate)
+
+    def test_history_outlives_search(self):
+        # given
+        ordering = MoveOrdering()
+        ordering.record_cutoff(self.moves[1], Color.LIGHT_PIECE, 3, 4, 1)
+
+        # when
+        ordering.new_search()
+        ordered = ordering.order(self.moves, Color.LIGHT_PIECE, 1)
+
+        # then
+        self.assertTrue(ordered[0] is self.moves[1])
+        self.assertEqual(0, ordering.cutoffs)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import threading
+import unittest
+
+from elements import Color, Board, State, BitboardState, Pawn, King
+from heuristics import light_pieces_maximizing_heuristic
+from moves import signature
+from parallel import ParallelAlphaBetaGameStrategy
+from strategies import AlphaBetaGameStrategy, SearchStopped
+from transposition import SharedTranspositionTable, LOWER_BOUND
+
+
+class ParallelAlphaBetaTestCase(unittest.TestCase):
+    def setUp(self):
+        board = Board()
+        board.prepare_pieces()
+        state = State(8, 8)
+        state.add(1, 2, King(Color.DARK_PIECE))
+        state.add(2, 3, Pawn(Color.LIGHT_PIECE))
+        state.add(6, 5, Pawn(Color.LIGHT_PIECE))
+        state.add(5, 2, Pawn(Color.DARK_PIECE))
+        state.add(3, 6, Pawn(Color.DARK_PIECE))
+        self.states = [board.state, state]
+
+    def test_root_split_matches_single_process(self):
+        # given
+        strategy = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 4, tt_memory_mb=0)
+        parallel_strategy = ParallelAlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 4,
+                                                          tt_memory_mb=0, workers=2)
+
+        # when
+        try:
+            moves = [(strategy.move(state)[0], parallel_strategy.move(state)[0]) for state in self.states]
+        finally:
+            parallel_strategy.close()
+
+        # then
+        for move, parallel_move in moves:
+            self.assertEqual(signature(move), signature(parallel_move))
+
+    def test_root_split_all_moves_lose(self):
+        # given
+        parallel_strategy = ParallelAlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 3,
+                                                          tt_memory_mb=0, workers=2)
+        state = State(5, 5)
+        state.add(2, 3, Pawn(Color.LIGHT_PIECE))
+        state.add(0, 1, Pawn(Color.LIGHT_PIECE))
+        state.add(1, 0, Pawn(Color.DARK_PIECE))
+        state.add(2, 1, Pawn(Color.DARK_PIECE))
+
+        # when
+        try:
+            move, is_next_beat = parallel_strategy.move(state)
+        finally:
+            parallel_strategy.close()
+
+        # then
+        self.assertEqual(((2, 3), (1, 2)), signature(move))
+
+    def test_lazy_smp_matches_single_process(self):
+        # given
+        strategy = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 4, tt_memory_mb=1)
+        parallel_strategy = ParallelAlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 4,
+                                                          tt_memory_mb=1, workers=2,
+                                                          mode=ParallelAlphaBetaGameStrategy.LAZY_SMP)
+
+        # when
+        try:
+            moves = [(strategy.move(state)[0], parallel_strategy.move(state)[0]) for state in self.states]
+        finally:
+            parallel_strategy.close()
+
+        # then
+        for move, parallel_move in moves:
+            self.assertEqual(signature(move), signature(parallel_move))
+
+    def test_stop_event(self):
+        for mode in (ParallelAlphaBetaGameStrategy.ROOT_SPLIT, ParallelAlphaBetaGameStrategy.LAZY_SMP):
+            # given
+            parallel_strategy = ParallelAlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic,
+                                                              8, tt_memory_mb=1, workers=2, mode=mode)
+            parallel_strategy.stop_event = threading.Event()
+            parallel_strategy.stop_event.set()
+
+            # when
+            try:
+                with self.assertRaises(SearchStopped):
+                    parallel_strategy.move(self.states[0])
+            finally:
+                parallel_strategy.close()
+
+
+class SharedTranspositionTableTestCase(unittest.TestCase):
+    def test_store_and_probe(self):
+        # given
+        table = SharedTranspositionTable(memory_mb=1)
+
+        # when
+        table.store(2 ** 63 + 5, 6, -3, LOWER_BOUND, ((1, 2), (2, 3)))
+        entry = table.probe(2 ** 63 + 5)
+
+        # then
+        self.assertEqual((6, -3, LOWER_BOUND, ((1, 2), (2, 3))),
+                         (entry.depth, entry.value, entry.bound, entry.best_move))
+        self.assertIsNone(table.probe(5))
+
+
+class EncodingTestCase(unittest.TestCase):
+    def test_encode_and_decode(self):
+        # given
+        state = BitboardState(8, 8)
+        state.add(1, 2, King(Color.DARK_PIECE))
+        state.add(2, 3, Pawn(Color.LIGHT_PIECE))
+
+        # when
+        decoded = BitboardState.decode(state.encode())
+
+        # then
+        self.assertEqual(state.encode(), decoded.encode())
+        self.assertEqual((1, 1), (decoded.light_pieces, decoded.dark_pieces))
+        self.assertTrue(isinstance(decoded.get_piece(1, 2), King))
+
+
+if __name__ == '__main__':
+    unittest.main()
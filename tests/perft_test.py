@@ -0,0 +1,67 @@
+import unittest
+
+from elements import Color, State, Pawn, King
+from perft import perft, divide, initial_state
+
+# counts of the original recursive move generation, moves taking several pieces count once
+INITIAL_COUNTS = [7, 49, 302, 1469, 7482, 37986]
+
+# name, light pawns, light kings, dark pawns, dark kings, counts with light and with dark to move
+POSITIONS = [
+    ('kings', [(2, 5), (6, 7)], [(0, 7), (5, 2)], [(3, 0), (1, 2)], [(7, 0), (6, 3)],
+     [1, 1, 6, 22, 265], [3, 17, 144, 1323, 11927]),
+    ('chain_captures', [(4, 7), (0, 5)], [], [(3, 6), (3, 4), (5, 4), (5, 2), (1, 2), (3, 2)], [],
+     [3, 16, 44, 179, 559, 1955], [11, 22, 121, 314, 1332, 3622]),
+    ('promotion', [(1, 2), (5, 2), (6, 1)], [], [(2, 5), (4, 5), (0, 1)], [(7, 6)],
+     [4, 4, 15, 163, 749, 6580], [1, 3, 39, 151, 1492, 6668]),
+]
+
+
+def position_state(light_pawns, light_kings, dark_pawns, dark_kings):
+    state = State(8, 8)
+    for squares, piece in [(light_pawns, Pawn(Color.LIGHT_PIECE)), (light_kings, King(Color.LIGHT_PIECE)),
+                           (dark_pawns, Pawn(Color.DARK_PIECE)), (dark_kings, King(Color.DARK_PIECE))]:
+        for x, y in squares:
+            state.add(x, y, piece)
+    return state
+
+
+class PerftTestCase(unittest.TestCase):
+    def test_initial_position(self):
+        # given
+        state = initial_state()
+
+        # when
+        counts = [perft(state, Color.LIGHT_PIECE, depth) for depth in range(1, len(INITIAL_COUNTS) + 1)]
+
+        # then
+        self.assertEqual(INITIAL_COUNTS, counts)
+        self.assertEqual(1, perft(state, Color.LIGHT_PIECE, 0))
+
+    def test_positions(self):
+        for name, light_pawns, light_kings, dark_pawns, dark_kings, light_counts, dark_counts in POSITIONS:
+            for color, expected_counts in [(Color.LIGHT_PIECE, light_counts), (Color.DARK_PIECE, dark_counts)]:
+                # given
+                state = position_state(light_pawns, light_kings, dark_pawns, dark_kings)
+
+                # when
+                counts = [perft(state, color, depth) for depth in range(1, len(expected_counts) + 1)]
+
+                # then
+                self.assertEqual(expected_counts, counts, '{} with {} to move'.format(name, Color.name(color)))
+
+    def test_divide(self):
+        # given
+        state = initial_state()
+
+        # when
+        counts = divide(state, Color.LIGHT_PIECE, 4)
+
+        # then
+        self.assertEqual(7, len(counts))
+        self.assertEqual(INITIAL_COUNTS[3], sum(counts.values()))
+        self.assertTrue(all(len(move) == 2 for move in counts))
+
+
+if __name__ == '__main__':
+    unittest.main()
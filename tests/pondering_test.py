@@ -0,0 +1,59 @@
+import unittest
+
+from elements import Color, Board, State, Pawn
+from heuristics import light_pieces_maximizing_heuristic
+from moves import signature
+from pondering import PonderingGameStrategy
+from strategies import AlphaBetaGameStrategy, GameStrategy
+
+
+def new_strategy():
+    return AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 4, tt_memory_mb=1)
+
+
+class PonderingTestCase(unittest.TestCase):
+    def setUp(self):
+        board = Board()
+        board.prepare_pieces()
+        self.state = board.state
+
+    def test_predicted_reply_answered_from_cache(self):
+        # given
+        strategy = PonderingGameStrategy(new_strategy())
+        move, _ = strategy.move(self.state)
+        GameStrategy._apply(self.state, move)
+        strategy._ponder_thread.join(60)
+        replies = strategy._calculate_all_moves(self.state, Color.DARK_PIECE)
+
+        # when
+        GameStrategy._apply(self.state, replies[-1])
+        answer, is_next_beat = strategy.move(self.state)
+        strategy.close()
+
+        # then
+        self.assertEqual(1, strategy.ponder_hits)
+        self.assertEqual(1, strategy.ponder_misses)
+        self.assertFalse(is_next_beat)
+        self.assertIn(signature(answer),
+                      [signature(move) for move in strategy._calculate_all_moves(self.state, Color.LIGHT_PIECE)])
+
+    def test_misprediction_searches_again(self):
+        # given
+        strategy = PonderingGameStrategy(new_strategy())
+        strategy.move(self.state)
+        state = State(8, 8)
+        state.add(2, 5, Pawn(Color.LIGHT_PIECE))
+        state.add(5, 2, Pawn(Color.DARK_PIECE))
+
+        # when
+        answer, _ = strategy.move(state)
+        strategy.close()
+
+        # then
+        self.assertEqual(0, strategy.ponder_hits)
+        self.assertEqual(2, strategy.ponder_misses)
+        self.assertEqual(signature(new_strategy().move(state)[0]), signature(answer))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import pygame
+
+from elements import Board, Color
+from rendering import BoardRenderer, square_size, PIECE_COLORS, LIGHT_SQUARE
+
+
+class RenderingTestCase(unittest.TestCase):
+    def test_engine_imports_without_pygame(self):
+        # given
+        code = 'import sys, strategies, match; print("pygame" in sys.modules, "pkg_resources" in sys.modules)'
+
+        # when
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(sys.modules[Board.__module__].__file__), check=True).stdout
+
+        # then
+        self.assertEqual('False False', output.strip())
+
+    def test_draw(self):
+        # given
+        board = Board()
+        board.prepare_pieces()
+        state = board.state
+        state.transform_into_king(1, 0)
+        board.state = state
+        surface = pygame.Surface((640, 640))
+
+        # when
+        BoardRenderer(board).draw(surface)
+
+        # then
+        square_w, square_h = square_size(surface)
+        self.assertEqual((80, 80), (square_w, square_h))
+        self.assertEqual(LIGHT_SQUARE, tuple(surface.get_at((square_w // 2, square_h - 1)))[:3])
+        self.assertEqual(PIECE_COLORS[Color.DARK_PIECE],
+                         tuple(surface.get_at((3 * square_w // 2 + 10, 5 * square_h // 2)))[:3])
+        self.assertEqual(PIECE_COLORS[Color.LIGHT_PIECE],
+                         tuple(surface.get_at((square_w // 2 + 10, 11 * square_h // 2)))[:3])
+
+    def test_draw_only_changed_squares(self):
+        # given
+        board = Board()
+        board.prepare_pieces()
+        surface = pygame.Surface((640, 640))
+        renderer = BoardRenderer(board)
+        full_rects = renderer.draw(surface)
+
+        # when
+        unchanged_rects = renderer.draw(surface)
+        state = board.state
+        piece = state.get_piece(0, 5)
+        state.remove(0, 5)
+        state.add(1, 4, piece)
+        board.state = state
+        moved_rects = renderer.draw(surface)
+
+        # then
+        expected = pygame.Surface((640, 640))
+        BoardRenderer(board).draw(expected)
+        self.assertEqual(64, len(full_rects))
+        self.assertEqual([], unchanged_rects)
+        self.assertEqual({(0, 400, 80, 80), (80, 320, 80, 80)}, {tuple(rect) for rect in moved_rects})
+        self.assertEqual(pygame.image.tostring(expected, 'RGB'), pygame.image.tostring(surface, 'RGB'))
+
+    def test_invalidate_and_resize_redraw_everything(self):
+        # given
+        board = Board()
+        board.prepare_pieces()
+        renderer = BoardRenderer(board)
+        renderer.draw(pygame.Surface((640, 640)))
+
+        # when
+        renderer.invalidate()
+        invalidated_rects = renderer.draw(pygame.Surface((640, 640)))
+        resized_rects = renderer.draw(pygame.Surface((320, 320)))
+
+        # then
+        self.assertEqual(64, len(invalidated_rects))
+        self.assertEqual(64, len(resized_rects))
+        self.assertEqual((40, 40), tuple(resized_rects[0].size))
+
+
+if __name__ == '__main__':
+    unittest.main()
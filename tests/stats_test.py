@@ -0,0 +1,103 @@
+import json
+import unittest
+
+from elements import Color, Board
+from heuristics import light_pieces_maximizing_heuristic
+from match import Match
+from stats import SearchStats
+from strategies import AlphaBetaGameStrategy, MinMaxGameStrategy, RandomGameStrategy
+from ordering import MoveOrdering
+
+
+class SearchStatsTestCase(unittest.TestCase):
+    def setUp(self):
+        board = Board()
+        board.prepare_pieces()
+        self.state = board.state
+
+    def test_rates(self):
+        # given
+        stats = SearchStats()
+        stats.cutoffs, stats.first_move_cutoffs = 10, 8
+        stats.tt_probes, stats.tt_hits = 4, 1
+        stats.iterations = [(1, 10, 0.1), (2, 30, 0.2), (3, 120, 0.5)]
+
+        # then
+        self.assertEqual(0.8, stats.first_move_cutoff_rate)
+        self.assertEqual(0.25, stats.tt_hit_rate)
+        self.assertEqual(4, stats.effective_branching_factor)
+        self.assertEqual(3, stats.depth)
+        self.assertEqual(0.0, SearchStats().effective_branching_factor)
+
+    def test_min_max_counts_every_node(self):
+        # given
+        strategy = MinMaxGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 3, stats=True)
+
+        # when
+        strategy.move(self.state)
+        stats = strategy.stats
+
+        # then
+        self.assertEqual(7 + 49 + 302, stats.nodes)
+        self.assertEqual(302, stats.leaves)
+        self.assertEqual([3], [depth for depth, _, _ in stats.iterations])
+
+    def test_alpha_beta(self):
+        # given
+        strategy = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 5,
+                                         move_ordering=MoveOrdering(), stats=True)
+
+        # when
+        strategy.move(self.state)
+        stats = strategy.stats
+        record = json.loads(stats.to_json())
+
+        # then
+        self.assertEqual(strategy.search_progress[1], stats.nodes)
+        self.assertGreater(stats.leaves, 0)
+        self.assertGreater(stats.cutoffs, 0)
+        self.assertTrue(0 < stats.first_move_cutoff_rate <= 1)
+        self.assertTrue(0 <= stats.tt_hit_rate <= 1)
+        self.assertEqual(5, record['depth'])
+        self.assertEqual(stats.nodes, record['iterations'][0]['nodes'])
+
+    def test_alpha_beta_iterations(self):
+        # given
+        strategy = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 4, time_ms=10000,
+                                         stats=True)
+
+        # when
+        strategy.move(self.state)
+        stats = strategy.stats
+
+        # then
+        self.assertEqual([1, 2, 3, 4], [depth for depth, _, _ in stats.iterations])
+        self.assertEqual(stats.nodes, sum(nodes for _, nodes, _ in stats.iterations))
+        self.assertGreater(stats.effective_branching_factor, 1)
+
+    def test_disabled(self):
+        # given
+        strategy = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 3)
+
+        # when
+        strategy.move(self.state)
+
+        # then
+        self.assertIsNone(strategy.stats)
+
+    def test_game_record(self):
+        # given
+        match = Match(AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 2, stats=True),
+                      RandomGameStrategy(Color.DARK_PIECE), max_plies=4)
+
+        # when
+        record = match.play().to_dict()
+
+        # then
+        self.assertEqual(4, len(record['stats']))
+        self.assertIsNotNone(record['stats'][0])
+        self.assertIsNone(record['stats'][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
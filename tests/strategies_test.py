@@ -1,8 +1,10 @@
+import time
 import unittest
 
-from elements import Color, State, Pawn
-from heuristics import light_pieces_dark_pieces_difference_heuristic
-from strategies import MinMaxGameStrategy
+from elements import Color, State, BitboardState, Pawn, King, Board
+from heuristics import light_pieces_dark_pieces_difference_heuristic, dark_pieces_maximizing_heuristic
+from moves import signature
+from strategies import MinMaxGameStrategy, AlphaBetaGameStrategy, RandomGameStrategy
 
 
 class MinMaxTestCase(unittest.TestCase):
@@ -20,7 +22,7 @@ class MinMaxTestCase(unittest.TestCase):
 
         # when
         move, is_next_beat = strategy.move(state)
-        next_state = move[-1].execute()
+        next_state = move.execute(state)
 
         # then
         self.assertFalse(next_state.get_piece(2, 4))
@@ -45,7 +47,7 @@ class MinMaxTestCase(unittest.TestCase):
 
         # when
         move, is_next_beat = strategy.move(state)
-        next_state = move[-1].execute()
+        next_state = move.execute(state)
 
         # then
         self.assertFalse(next_state.get_piece(3, 3))
@@ -64,11 +66,271 @@ class MinMaxTestCase(unittest.TestCase):
 
         # when
         move, is_next_beat = strategy.move(state)
-        next_state = move[-1].execute()
+        next_state = move.execute(state)
 
         # then
         self.assertFalse(next_state.get_piece(1, 1))
 
+    def test_quiescence(self):
+        # given
+        strategies = [MinMaxGameStrategy(color=Color.LIGHT_PIECE,
+                                         heuristic=light_pieces_dark_pieces_difference_heuristic,
+                                         depth=1, stats=True, quiescence_nodes=quiescence_nodes)
+                      for quiescence_nodes in (0, 8)]
+
+        state = State(5, 5)
+        state.add(2, 4, Pawn(Color.LIGHT_PIECE))
+        state.add(0, 2, Pawn(Color.DARK_PIECE))
+
+        # when
+        moves = [strategy.move(state)[0] for strategy in strategies]
+
+        # then
+        self.assertEqual((1, 3), moves[0].destination)
+        self.assertEqual((3, 3), moves[1].destination)
+        self.assertEqual(0, strategies[0].stats.quiescence_nodes)
+        self.assertEqual(1, strategies[1].stats.quiescence_nodes)
+
+
+class AlphaBetaTestCase(unittest.TestCase):
+    def test_time_budget(self):
+        # given
+        strategy = AlphaBetaGameStrategy(color=Color.LIGHT_PIECE,
+                                         heuristic=light_pieces_dark_pieces_difference_heuristic,
+                                         time_ms=200)
+        board = Board()
+        board.prepare_pieces()
+
+        # when
+        start = time.monotonic()
+        move, is_next_beat = strategy.move(board.state)
+        elapsed = time.monotonic() - start
+
+        # then
+        self.assertTrue(move)
+        self.assertLess(elapsed, 1.0)
+
+    def test_iterative_deepening_finds_beat(self):
+        # given
+        strategy = AlphaBetaGameStrategy(color=Color.LIGHT_PIECE,
+                                         heuristic=light_pieces_dark_pieces_difference_heuristic,
+                                         depth=3, time_ms=10000)
+
+        state = State(5, 5)
+        state.add(0, 4, Pawn(Color.LIGHT_PIECE))
+        state.add(2, 4, Pawn(Color.LIGHT_PIECE))
+        state.add(3, 3, Pawn(Color.LIGHT_PIECE))
+        state.add(1, 1, Pawn(Color.DARK_PIECE))
+        state.add(3, 1, Pawn(Color.DARK_PIECE))
+        state.add(0, 2, Pawn(Color.DARK_PIECE))
+
+        # when
+        move, is_next_beat = strategy.move(state)
+        next_state = move.execute(state)
+
+        # then
+        self.assertFalse(next_state.get_piece(3, 3))
+        self.assertTrue(next_state.get_piece(2, 2))
+
+    def test_principal_variation_search(self):
+        # given
+        board = Board()
+        board.prepare_pieces()
+        strategies = [AlphaBetaGameStrategy(color=Color.DARK_PIECE,
+                                            heuristic=dark_pieces_maximizing_heuristic,
+                                            depth=5, tt_memory_mb=0, principal_variation=principal_variation)
+                      for principal_variation in (False, True)]
+
+        # when
+        results = []
+        for strategy in strategies:
+            state = board.state
+            moves = strategy._calculate_all_moves(state, Color.DARK_PIECE)
+            results.append(strategy._search_root(state, moves, 5))
+
+        # then
+        self.assertTrue(results[0][0] is not None)
+        self.assertEqual(results[0][1], results[1][1])
+
+    def test_aspiration_window_fail(self):
+        # given
+        strategy = AlphaBetaGameStrategy(color=Color.LIGHT_PIECE,
+                                         heuristic=light_pieces_dark_pieces_difference_heuristic,
+                                         depth=1, aspiration_window=1)
+
+        state = State(5, 5)
+        state.add(2, 4, Pawn(Color.LIGHT_PIECE))
+        state.add(1, 1, Pawn(Color.DARK_PIECE))
+        state.add(1, 3, Pawn(Color.DARK_PIECE))
+        state.add(3, 3, Pawn(Color.DARK_PIECE))
+        moves = strategy._calculate_all_moves(state, Color.LIGHT_PIECE)
+
+        # when
+        move, value = strategy._aspiration_search(state, moves, 1, previous_value=-5)
+
+        # then
+        self.assertEqual(0, value)
+        self.assertEqual((2, 0), move.destination)
+
+    def test_all_moves_lose(self):
+        # given
+        strategy = AlphaBetaGameStrategy(color=Color.LIGHT_PIECE,
+                                         heuristic=light_pieces_dark_pieces_difference_heuristic,
+                                         depth=3, time_ms=10000)
+
+        state = State(5, 5)
+        state.add(2, 3, Pawn(Color.LIGHT_PIECE))
+        state.add(0, 1, Pawn(Color.LIGHT_PIECE))
+        state.add(1, 0, Pawn(Color.DARK_PIECE))
+        state.add(2, 1, Pawn(Color.DARK_PIECE))
+
+        # when
+        move, is_next_beat = strategy.move(state)
+
+        # then
+        self.assertEqual((2, 3), move.origin)
+
+    def test_quiescence(self):
+        # given
+        strategies = [AlphaBetaGameStrategy(color=Color.LIGHT_PIECE,
+                                            heuristic=light_pieces_dark_pieces_difference_heuristic,
+                                            depth=1, stats=True, quiescence_nodes=quiescence_nodes)
+                      for quiescence_nodes in (0, 8)]
+
+        state = State(5, 5)
+        state.add(2, 4, Pawn(Color.LIGHT_PIECE))
+        state.add(0, 2, Pawn(Color.DARK_PIECE))
+
+        # when
+        moves = [strategy.move(state)[0] for strategy in strategies]
+
+        # then
+        self.assertEqual((1, 3), moves[0].destination)
+        self.assertEqual((3, 3), moves[1].destination)
+        self.assertEqual(1, strategies[1].stats.quiescence_nodes)
+        self.assertEqual(strategies[0].stats.nodes + 1, strategies[1].stats.nodes)
+        self.assertEqual(strategies[1].stats.nodes, strategies[1].search_progress[1])
+
+    def test_quiescence_budget(self):
+        # given
+        strategies = [AlphaBetaGameStrategy(color=Color.LIGHT_PIECE,
+                                            heuristic=light_pieces_dark_pieces_difference_heuristic,
+                                            quiescence_nodes=quiescence_nodes)
+                      for quiescence_nodes in (0, 1)]
+
+        state = State(5, 5)
+        state.add(1, 3, Pawn(Color.LIGHT_PIECE))
+        state.add(0, 2, Pawn(Color.DARK_PIECE))
+
+        # when
+        values = [strategy.alpha_beta(state, Color.DARK_PIECE, float('-inf'), float('inf'), 0)
+                  for strategy in strategies]
+
+        # then
+        self.assertEqual([0, -1], values)
+
+
+class CaptureGenerationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.state = BitboardState(8, 8)
+        self.state.add(0, 7, King(Color.LIGHT_PIECE))
+        for x, y in [(2, 5), (4, 3), (4, 5)]:
+            self.state.add(x, y, Pawn(Color.DARK_PIECE))
+        self.strategy = RandomGameStrategy(Color.LIGHT_PIECE)
+
+    def test_capture_paths(self):
+        # given
+        key = self.state.key
+
+        # when
+        paths = list(self.strategy._capture_paths((0, 7), self.state))
+
+        # then
+        self.assertEqual(((0, 7), (2, 5), (3, 4), (4, 5), (5, 6)), paths[0])
+        self.assertEqual(5, len(paths))
+        self.assertTrue(all(path[:3] == ((0, 7), (2, 5), (3, 4)) for path in paths))
+        self.assertEqual(key, self.state.key)
+        self.assertTrue(self.state.get_piece(0, 7))
+
+    def test_capture_paths_closed_early(self):
+        # given
+        key = self.state.key
+        paths = self.strategy._capture_paths((0, 7), self.state)
+
+        # when
+        next(paths)
+        paths.close()
+
+        # then
+        self.assertEqual(key, self.state.key)
+
+    def test_moves_from_paths(self):
+        # given
+        paths = list(self.strategy._capture_paths((0, 7), self.state))
+
+        # when
+        moves = self.strategy._moves_from_paths(self.state, paths)
+        next_state = moves[0].execute(self.state)
+
+        # then
+        self.assertEqual([path[::2] for path in paths], [move.squares for move in moves])
+        self.assertEqual(((2, 5), (4, 5)), moves[0].captures)
+        self.assertEqual(1, next_state.dark_pieces)
+        self.assertTrue(next_state.get_piece(5, 6))
+        self.assertTrue(next_state.get_piece(4, 3))
+
+
+class MoveStagesTestCase(unittest.TestCase):
+    def setUp(self):
+        board = Board()
+        board.prepare_pieces()
+        self.state = board.state
+        self.strategy = RandomGameStrategy(Color.LIGHT_PIECE)
+
+    def test_quiet_moves_by_piece(self):
+        # given
+        moves = self.strategy._calculate_all_moves(self.state, Color.LIGHT_PIECE)
+
+        # when
+        stages = list(self.strategy._move_stages(self.state, Color.LIGHT_PIECE))
+
+        # then
+        self.assertEqual([signature(move) for move in moves], [signature(move) for stage in stages for move in stage])
+        self.assertTrue(all(len({move.origin for move in stage}) == 1 for stage in stages))
+
+    def test_first_move_stage(self):
+        # given
+        first = ((6, 5), (7, 4))
+
+        # when
+        stages = list(self.strategy._move_stages(self.state, Color.LIGHT_PIECE, first))
+
+        # then
+        self.assertEqual([first], [signature(move) for move in stages[0]])
+        self.assertEqual(7, sum(len(stage) for stage in stages))
+
+    def test_illegal_first_move(self):
+        # given
+        first = ((6, 5), (4, 3))
+
+        # when
+        stages = list(self.strategy._move_stages(self.state, Color.LIGHT_PIECE, first))
+
+        # then
+        self.assertEqual(7, sum(len(stage) for stage in stages))
+        self.assertNotIn(first, [signature(move) for stage in stages for move in stage])
+
+    def test_beats_only(self):
+        # given
+        self.state.add(4, 3, Pawn(Color.LIGHT_PIECE))
+
+        # when
+        stages = list(self.strategy._move_stages(self.state, Color.DARK_PIECE))
+
+        # then
+        self.assertEqual(1, len(stages))
+        self.assertEqual({((3, 2), (5, 4)), ((5, 2), (3, 4))}, {signature(move) for move in stages[0]})
+
 
 if __name__ == '__main__':
     unittest.main()
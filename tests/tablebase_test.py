@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from copy import copy
+
+from elements import Color, BitboardState, Pawn, King
+from heuristics import light_pieces_dark_pieces_difference_heuristic
+from strategies import AlphaBetaGameStrategy, calculate_all_moves
+from tablebase import Tablebase, generate_tablebase, DRAW, WIN, LOSS, WIN_VALUE
+
+
+class TablebaseTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'tablebase.bin')
+        generate_tablebase(cls.path, 2)
+        cls.tablebase = Tablebase(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebase.close()
+        cls.directory.cleanup()
+
+    def positions(self):
+        index = self.tablebase.index
+        for material in index.offsets:
+            for placement in index.positions(material):
+                state = BitboardState(index.rows, index.cols)
+                for squares, piece in zip(placement, (Pawn(Color.LIGHT_PIECE), King(Color.LIGHT_PIECE),
+                                                      Pawn(Color.DARK_PIECE), King(Color.DARK_PIECE))):
+                    for x, y in squares:
+                        state.add(x, y, piece)
+                for color in (Color.LIGHT_PIECE, Color.DARK_PIECE):
+                    yield state, color
+
+    def test_index_is_unique(self):
+        # when
+        indexes = [self.tablebase.index.index(state, color) for state, color in self.positions()]
+
+        # then
+        self.assertEqual(len(indexes), len(set(indexes)))
+        self.assertLess(max(indexes), self.tablebase.index.size)
+
+    def test_results_agree_with_moves(self):
+        for state, color in self.positions():
+            # given
+            result, distance = self.tablebase.probe(state, color)
+
+            # when
+            children = []
+            for move in calculate_all_moves(state, color):
+                child = copy(state)
+                move.apply(child)
+                children.append((LOSS, 0) if child.is_ending() else self.tablebase.probe(child, Color.opposite(color)))
+
+            # then
+            if result == WIN:
+                self.assertEqual(distance, 1 + min(d for r, d in children if r == LOSS))
+            elif result == LOSS:
+                self.assertTrue(all(r == WIN for r, d in children))
+                self.assertEqual(distance, 1 + max(d for r, d in children) if children else 0)
+            else:
+                self.assertEqual(DRAW, result)
+                self.assertNotIn(LOSS, [r for r, d in children])
+                self.assertIn(DRAW, [r for r, d in children])
+
+    def test_search_plays_quickest_win(self):
+        # given
+        state = BitboardState(8, 8)
+        state.add(0, 1, King(Color.LIGHT_PIECE))
+        state.add(1, 4, Pawn(Color.DARK_PIECE))
+        result, distance = self.tablebase.probe(state, Color.LIGHT_PIECE)
+        strategy = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_dark_pieces_difference_heuristic, 1,
+                                         tablebase=self.tablebase)
+
+        # when
+        move, _ = strategy.move(state)
+        strategy._apply(state, move)
+
+        # then
+        self.assertEqual((WIN, 5), (result, distance))
+        self.assertEqual((LOSS, distance - 1), self.tablebase.probe(state, Color.DARK_PIECE))
+        self.assertEqual(WIN_VALUE - distance + 1, strategy._tablebase_value(state, Color.DARK_PIECE))
+
+    def test_not_a_tablebase(self):
+        # given
+        path = os.path.join(self.directory.name, 'empty.bin')
+        with open(path, 'wb') as f:
+            f.write(b'\0' * 64)
+
+        # then
+        with self.assertRaises(ValueError):
+            Tablebase(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from elements import Color, Board
+from heuristics import light_pieces_maximizing_heuristic
+from moves import signature
+from strategies import AlphaBetaGameStrategy, RandomGameStrategy
+from thinking import BackgroundMove
+
+
+class BackgroundMoveTestCase(unittest.TestCase):
+    def setUp(self):
+        board = Board()
+        board.prepare_pieces()
+        self.state = board.state
+
+    def test_same_move_as_in_foreground(self):
+        # given
+        strategy = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 4)
+        expected_move, _ = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 4) \
+            .move(self.state)
+
+        # when
+        thinking = BackgroundMove(strategy, self.state)
+        thinking.wait(30)
+
+        # then
+        self.assertTrue(thinking.done())
+        move, is_next_beat = thinking.result()
+        self.assertEqual(signature(expected_move), signature(move))
+        self.assertFalse(is_next_beat)
+        self.assertEqual(4, thinking.progress[0])
+        self.assertGreater(thinking.progress[1], 0)
+        self.assertIsNone(strategy.stop_event)
+
+    def test_cancel(self):
+        # given
+        strategy = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_maximizing_heuristic, 14, tt_memory_mb=0)
+        thinking = BackgroundMove(strategy, self.state)
+
+        # when
+        thinking.cancel()
+
+        # then
+        self.assertTrue(thinking.wait(10))
+        self.assertIsNone(thinking.result())
+
+    def test_strategy_without_progress(self):
+        # when
+        thinking = BackgroundMove(RandomGameStrategy(Color.DARK_PIECE), self.state)
+        thinking.wait(10)
+
+        # then
+        self.assertIsNone(thinking.progress)
+        self.assertIsNotNone(thinking.result())
+
+
+if __name__ == '__main__':
+    unittest.main()
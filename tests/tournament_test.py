@@ -0,0 +1,82 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+
+from elements import Color
+from tournament import Tournament, PlayerStats, GAUNTLET, ROUND_ROBIN, elo_difference, player_config, schedule, \
+    opening_seed
+
+
+class TournamentTestCase(unittest.TestCase):
+    def test_round_robin_schedule(self):
+        # when
+        games = schedule(['a', 'b', 'c'], ROUND_ROBIN, 2)
+
+        # then
+        self.assertEqual([('a', 'b'), ('b', 'a'), ('a', 'c'), ('c', 'a'), ('b', 'c'), ('c', 'b')], games)
+
+    def test_gauntlet_schedule(self):
+        # when
+        games = schedule(['a', 'b', 'c'], GAUNTLET, 3)
+
+        # then
+        self.assertEqual([('a', 'b'), ('b', 'a'), ('a', 'b'), ('a', 'c'), ('c', 'a'), ('a', 'c')], games)
+
+    def test_opening_seeds_of_odd_games(self):
+        # when
+        seeds = [opening_seed(7, game, 3) for game in range(6)]
+
+        # then
+        self.assertEqual([7, 7, 8, 9, 9, 10], seeds)
+
+    def test_player_config_heuristic_follows_color(self):
+        # given
+        config = {'strategy': 'alpha_beta', 'heuristic': 'light_pieces_dark_pieces_difference', 'depth': 2}
+
+        # then
+        self.assertEqual('light_pieces_dark_pieces_difference',
+                         player_config(config, Color.LIGHT_PIECE)['heuristic'])
+        self.assertEqual('dark_pieces_light_pieces_difference',
+                         player_config(config, Color.DARK_PIECE)['heuristic'])
+        self.assertEqual('light_pieces_dark_pieces_difference', config['heuristic'])
+
+    def test_elo(self):
+        # given
+        player = PlayerStats('a')
+        player.wins, player.draws, player.losses = 30, 20, 10
+
+        # when
+        elo, elo_low, elo_high = player.elo()
+
+        # then
+        self.assertAlmostEqual(elo_difference(0.666667), elo, places=3)
+        self.assertLess(elo_low, elo)
+        self.assertGreater(elo_high, elo)
+        self.assertEqual(0, elo_difference(0.5))
+        self.assertEqual(math.inf, elo_difference(1))
+
+    def test_play(self):
+        # given
+        players = [{'name': 'alpha_beta', 'strategy': 'alpha_beta', 'heuristic': 'light_pieces_maximizing',
+                    'depth': 2},
+                   {'name': 'random', 'strategy': 'random'}]
+        tournament = Tournament(players, games=2, workers=2, max_plies=40, opening_plies=2)
+
+        # when
+        with tempfile.TemporaryDirectory() as directory:
+            results_path = os.path.join(directory, 'results.jsonl')
+            standings = tournament.play(results_path)
+            with open(results_path) as f:
+                results = [json.loads(line) for line in f]
+
+        # then
+        self.assertEqual([0, 1], sorted(result['game'] for result in results))
+        self.assertEqual(2, len(standings))
+        self.assertEqual([2, 2], [player.games for player in standings])
+        self.assertEqual(sum(player.wins for player in standings), sum(player.losses for player in standings))
+
+
+if __name__ == '__main__':
+    unittest.main()
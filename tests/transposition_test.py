@@ -0,0 +1,68 @@
+import unittest
+
+from elements import Color, BitboardState, Pawn
+from heuristics import light_pieces_dark_pieces_difference_heuristic
+from strategies import AlphaBetaGameStrategy
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+
+class TranspositionTableTestCase(unittest.TestCase):
+    def test_store_and_probe(self):
+        # given
+        table = TranspositionTable(memory_mb=1)
+
+        # when
+        table.store(12345, 3, 7, EXACT, ((0, 0), (1, 1)))
+        entry = table.probe(12345)
+
+        # then
+        self.assertEqual((3, 7, EXACT, ((0, 0), (1, 1))), (entry.depth, entry.value, entry.bound, entry.best_move))
+        self.assertIsNone(table.probe(12345 + table.size))
+
+    def test_depth_preferred_replacement(self):
+        # given
+        table = TranspositionTable(memory_mb=1)
+        table.store(1, 5, 0, EXACT, None)
+
+        # when
+        table.store(1 + table.size, 2, 0, EXACT, None)
+
+        # then
+        self.assertIsNotNone(table.probe(1))
+
+        # when
+        table.new_search()
+        table.store(1 + table.size, 2, 0, EXACT, None)
+
+        # then
+        self.assertIsNone(table.probe(1))
+        self.assertIsNotNone(table.probe(1 + table.size))
+
+    def test_bound(self):
+        self.assertEqual(UPPER_BOUND, TranspositionTable.bound(-1, -1, 1))
+        self.assertEqual(LOWER_BOUND, TranspositionTable.bound(1, -1, 1))
+        self.assertEqual(EXACT, TranspositionTable.bound(0, -1, 1))
+
+
+class AlphaBetaTranspositionTestCase(unittest.TestCase):
+    def test_same_value_with_and_without_table(self):
+        # given
+        state = BitboardState(6, 6)
+        for x, y in [(1, 0), (3, 0), (5, 0), (0, 1), (2, 1)]:
+            state.add(x, y, Pawn(Color.DARK_PIECE))
+        for x, y in [(1, 4), (3, 4), (0, 5), (2, 5), (4, 5)]:
+            state.add(x, y, Pawn(Color.LIGHT_PIECE))
+        with_table = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_dark_pieces_difference_heuristic, 5)
+        without_table = AlphaBetaGameStrategy(Color.LIGHT_PIECE, light_pieces_dark_pieces_difference_heuristic, 5,
+                                              tt_memory_mb=0)
+
+        # when
+        values = [strategy.alpha_beta(state, Color.LIGHT_PIECE, -100, 100, 5)
+                  for strategy in (with_table, without_table)]
+
+        # then
+        self.assertEqual(values[0], values[1])
+
+
+if __name__ == '__main__':
+    unittest.main()